@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark greedy vs bounded exact budget packing.
+
+For synthetic file sets (default 100, 1k, 5k and 20k files) with skewed
+token estimates and Tier 1 affinity groups, packs into subtopics and
+reports bins used against the L2 lower bound, plus time per mode. The
+default budgets are 6,000 tokens (2,400 words x 2.5) and a tight 800
+tokens where files are large relative to the budget and greedy packing
+leaves a gap to the bound.
+
+Usage:
+    python -m scripts.benchmarks.bench_budget_packing [--sizes 100,1000,5000,20000]
+        [--budgets 6000,800] [--max-nodes 50000]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from scripts.lib.budget_packing import pack_files
+
+
+def synthetic_files(count: int, seed: int = 0) -> tuple:
+    """Return (tokens, affinity) for ``count`` files."""
+    rng = random.Random(seed)
+    tokens = {}
+    affinity = {}
+    anchors = max(count // 50, 1)
+    for i in range(count):
+        path = f"src/module-{i // 40}/file-{i}.ts"
+        tokens[path] = min(int(rng.lognormvariate(5.5, 0.9)), 4000)
+        if rng.random() < 0.2:
+            affinity[path] = [f"anchor-{rng.randrange(anchors)}"]
+    return tokens, affinity
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000,20000")
+    parser.add_argument("--budgets", default="6000,800")
+    parser.add_argument("--max-nodes", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'budget':>6} {'files':>7} {'bound':>6} {'greedy':>7} {'time':>9} "
+          f"{'exact':>6} {'time':>10} {'optimal':>8}")
+    for budget, count in (
+        (int(b), int(s)) for b in args.budgets.split(",") for s in args.sizes.split(",")
+    ):
+        tokens, affinity = synthetic_files(count)
+
+        start = time.perf_counter()
+        greedy = pack_files(tokens, budget, affinity)
+        greedy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact = pack_files(tokens, budget, affinity, mode="exact", max_nodes=args.max_nodes)
+        exact_s = time.perf_counter() - start
+
+        for partition in (greedy, exact):
+            if sorted(f for b in partition.bins for f in b) != sorted(tokens):
+                print(f"files lost or duplicated at {count}", file=sys.stderr)
+                return 1
+        print(f"{budget:>6} {count:>7,} {greedy.lower_bound:>6} {len(greedy.bins):>7} "
+              f"{greedy_s * 1000:>7.1f}ms {len(exact.bins):>6} {exact_s * 1000:>8.1f}ms "
+              f"{str(exact.optimal):>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
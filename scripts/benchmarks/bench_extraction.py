@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark parallel metadata extraction at several worker counts.
+
+Generates a synthetic corpus of markdown files with YAML frontmatter,
+ingests it with ``ingest_files`` at each worker count, checks the results
+are identical, and reports files/sec.
+
+Usage:
+    python -m scripts.benchmarks.bench_extraction [--files 20000]
+        [--jobs 1 2 4 8] [--batch-size 256]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from scripts.lib.file_ingest import DEFAULT_BATCH_SIZE, ingest_files
+from scripts.lib.tier_classifier import FileInfo
+
+_FRONTMATTER = """---
+id: doc-{i}
+title: Synthetic document {i}
+role: reference
+tags: [alpha, beta, gamma]
+source_files:
+  - path: src/module-{i}/index.ts
+    hash: a3f2b8c1
+  - path: src/module-{i}/handler.ts
+    hash: 9d1e4f7a
+---
+"""
+
+
+def generate_corpus(root: str, count: int) -> list:
+    """Write ``count`` markdown files and return FileInfo for each."""
+    body = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40
+    infos = []
+    for i in range(count):
+        rel = f"docs/d{i // 1000}/doc-{i}.md"
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(_FRONTMATTER.format(i=i) + body)
+        infos.append(FileInfo(path=path, relative_path=rel, tier=3, node_type="implementation"))
+    return infos
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="docgen-extract-bench-")
+    try:
+        infos = generate_corpus(root, args.files)
+        reference = None
+        for jobs in args.jobs:
+            start = time.perf_counter()
+            results = ingest_files(infos, jobs=jobs, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference = results
+            elif results != reference:
+                print(f"MISMATCH: jobs={jobs} results differ from jobs={args.jobs[0]}")
+                return 1
+            print(f"jobs={jobs:<3d} {elapsed:8.3f}s  ({len(results) / elapsed:,.0f} files/s)")
+    finally:
+        shutil.rmtree(root)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
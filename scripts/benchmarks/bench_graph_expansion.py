@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark topic expansion: per-node SQL queries against the in-memory graph.
+
+For synthetic graphs of 10k, 100k and 1M edges (nodes = edges / 10), times
+loading the graph from an in-memory index and expanding from random seeds
+with default-style depth caps. The baseline issues one indexed SQL query
+per frontier node per edge type, as a naive Story 1.8 traversal would.
+Both must reach the same set of files.
+
+Usage:
+    python -m scripts.benchmarks.bench_graph_expansion [--sizes 10000,100000,1000000]
+        [--queries 20] [--seeds 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from scripts.benchmarks.bench_index_writer import synthetic_graph
+from scripts.lib.graph_index import RepoGraph
+from scripts.lib.index_writer import IndexWriter
+from scripts.lib.schema import create_schema
+
+# synthetic_graph() edge types, capped like the Story 1.8 defaults.
+DEPTH_CAPS = {"imports": 2, "references": 2, "tests": 1, "configures": 1}
+
+
+def sql_expand(conn, seeds: list, caps: dict) -> set:
+    """Depth-capped BFS with one query per frontier node per edge type."""
+    visited = set(seeds)
+    frontier = list(seeds)
+    depth = 0
+    while frontier:
+        depth += 1
+        types = sorted(t for t, cap in caps.items() if cap >= depth)
+        if not types:
+            break
+        next_frontier = []
+        for node in frontier:
+            for edge_type in types:
+                rows = conn.execute(
+                    "SELECT target_id FROM edges WHERE edge_type = ? AND source_id = ?",
+                    (edge_type, node),
+                )
+                for (target,) in rows:
+                    if target not in visited:
+                        visited.add(target)
+                        next_frontier.append(target)
+        frontier = next_frontier
+    return visited
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seeds", type=int, default=3, help="seeds per query")
+    args = parser.parse_args()
+
+    print(f"{'edges':>10} {'load':>9} {'sql/query':>11} {'graph/query':>12} {'speedup':>8} {'avg files':>10}")
+    for edge_count in (int(s) for s in args.sizes.split(",")):
+        nodes, edges = synthetic_graph(max(edge_count // 10, 100), edge_count)
+        conn = create_schema(":memory:")
+        with IndexWriter(conn, bulk=True) as writer:
+            for row in nodes:
+                writer.add_node(row)
+            for row in edges:
+                writer.add_edge(*row)
+
+        start = time.perf_counter()
+        graph = RepoGraph.from_db(conn)
+        load_s = time.perf_counter() - start
+
+        rng = random.Random(1)
+        queries = [rng.sample(graph.ids, args.seeds) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        sql_results = [sql_expand(conn, seeds, DEPTH_CAPS) for seeds in queries]
+        sql_s = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        graph_results = [set(graph.expand(seeds, DEPTH_CAPS)) for seeds in queries]
+        graph_s = (time.perf_counter() - start) / len(queries)
+
+        if sql_results != graph_results:
+            print(f"MISMATCH at {edge_count:,} edges", file=sys.stderr)
+            return 1
+        avg_files = sum(map(len, graph_results)) / len(graph_results)
+        print(f"{edge_count:>10,} {load_s:>8.2f}s {sql_s * 1000:>9.2f}ms {graph_s * 1000:>10.2f}ms "
+              f"{sql_s / graph_s:>7.1f}x {avg_files:>10,.0f}")
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
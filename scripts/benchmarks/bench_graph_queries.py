@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark traversal queries with and without the secondary edge indexes.
+
+Builds a synthetic graph (default 100k nodes, 1M edges), then times reverse
+lookups ("who points at this file?"), forward lookups by edge type, and
+nodes-by-tier/type queries, first with the indexes from the current schema
+and then with them dropped.
+
+Usage:
+    python -m scripts.benchmarks.bench_graph_queries [--nodes 100000]
+        [--edges 1000000] [--queries 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from scripts.benchmarks.bench_index_writer import synthetic_graph
+from scripts.lib.index_writer import IndexWriter
+from scripts.lib.schema import create_schema
+
+QUERIES = {
+    "reverse lookup": "SELECT source_id FROM edges WHERE target_id = ? AND edge_type = 'imports'",
+    "forward by type": "SELECT target_id FROM edges WHERE source_id = ? AND edge_type = 'imports'",
+    "nodes by tier/type": "SELECT id FROM nodes WHERE tier = 3 AND type = ? LIMIT 50",
+}
+
+SECONDARY_INDEXES = ("idx_edges_target_type", "idx_edges_type_source", "idx_nodes_tier_type")
+
+
+def time_queries(conn, ids: list, count: int) -> dict:
+    """Milliseconds per query for each entry in QUERIES."""
+    rng = random.Random(1)
+    results = {}
+    for label, sql in QUERIES.items():
+        params = [(rng.choice(ids),) for _ in range(count)]
+        if label == "nodes by tier/type":
+            params = [("implementation",)] * count
+        start = time.perf_counter()
+        for p in params:
+            conn.execute(sql, p).fetchall()
+        results[label] = (time.perf_counter() - start) / count * 1000
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    nodes, edges = synthetic_graph(args.nodes, args.edges)
+    conn = create_schema(":memory:")
+    with IndexWriter(conn, bulk=True) as writer:
+        for row in nodes:
+            writer.add_node(row)
+        for row in edges:
+            writer.add_edge(*row)
+    ids = [row[0] for row in nodes]
+
+    indexed = time_queries(conn, ids, args.queries)
+    for name in SECONDARY_INDEXES:
+        conn.execute(f"DROP INDEX {name}")
+    conn.execute("ANALYZE")
+    unindexed = time_queries(conn, ids, max(1, args.queries // 20))
+    conn.close()
+
+    print(f"graph: {len(nodes):,} nodes, {len(edges):,} edges")
+    print(f"{'query':<20} {'indexed':>12} {'no index':>12} {'speedup':>9}")
+    for label in QUERIES:
+        print(f"{label:<20} {indexed[label]:9.3f} ms {unindexed[label]:9.3f} ms "
+              f"{unindexed[label] / indexed[label]:8.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark row-at-a-time inserts against the bulk IndexWriter.
+
+Inserts a synthetic graph (default 100k nodes, 1M edges) into a fresh
+on-disk index with ``IndexWriter(bulk=True)``. The row-at-a-time baseline
+(one autocommitted INSERT per row) is run on the first ``--baseline-rows``
+rows only and extrapolated, since running it in full takes far too long.
+
+Usage:
+    python -m scripts.benchmarks.bench_index_writer [--nodes 100000]
+        [--edges 1000000] [--baseline-rows 20000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from scripts.lib.index_writer import INSERT_EDGE_SQL, UPSERT_NODE_SQL, IndexWriter
+from scripts.lib.schema import create_schema
+
+
+def synthetic_graph(node_count: int, edge_count: int, seed: int = 0) -> tuple:
+    """Return (node rows, edge tuples) for a random graph."""
+    rng = random.Random(seed)
+    ids = [f"src/module-{i // 100}/file-{i}.ts" for i in range(node_count)]
+    nodes = [(i, 3, "implementation", i, 100, None, "2024-01-01T00:00:00+00:00") for i in ids]
+    edge_types = ("imports", "references", "tests", "configures")
+    edges = set()
+    while len(edges) < edge_count:
+        edges.add((rng.choice(ids), rng.choice(ids), rng.choice(edge_types)))
+    return nodes, sorted(edges)
+
+
+def row_at_a_time(db_path: str, nodes: list, edges: list) -> float:
+    conn = create_schema(db_path)
+    conn.isolation_level = None  # autocommit: one transaction per INSERT
+    start = time.perf_counter()
+    for row in nodes:
+        conn.execute(UPSERT_NODE_SQL, row)
+    for row in edges:
+        conn.execute(INSERT_EDGE_SQL, row)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def bulk(db_path: str, nodes: list, edges: list) -> float:
+    conn = create_schema(db_path)
+    start = time.perf_counter()
+    with IndexWriter(conn, bulk=True) as writer:
+        for row in nodes:
+            writer.add_node(row)
+        for row in edges:
+            writer.add_edge(*row)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--baseline-rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    nodes, edges = synthetic_graph(args.nodes, args.edges)
+    total_rows = len(nodes) + len(edges)
+    root = tempfile.mkdtemp(prefix="docgen-writer-bench-")
+    try:
+        # Baseline on a prefix: all its nodes first, then edges among them.
+        base_nodes = nodes[: args.baseline_rows // 2]
+        base_ids = {row[0] for row in base_nodes}
+        base_edges = [e for e in edges if e[0] in base_ids and e[1] in base_ids]
+        base_edges = base_edges[: args.baseline_rows - len(base_nodes)]
+        base_rows = len(base_nodes) + len(base_edges)
+        base_s = row_at_a_time(os.path.join(root, "rows.db"), base_nodes, base_edges)
+        base_rate = base_rows / base_s
+
+        bulk_s = bulk(os.path.join(root, "bulk.db"), nodes, edges)
+        bulk_rate = total_rows / bulk_s
+
+        print(f"rows:            {len(nodes):,} nodes + {len(edges):,} edges")
+        print(f"row-at-a-time:   {base_rate:12,.0f} rows/s  (measured on {base_rows:,} rows; "
+              f"~{total_rows / base_rate:,.0f}s extrapolated)")
+        print(f"bulk writer:     {bulk_rate:12,.0f} rows/s  ({bulk_s:.1f}s)")
+        print(f"speedup:         {bulk_rate / base_rate:12.1f}x")
+    finally:
+        shutil.rmtree(root)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
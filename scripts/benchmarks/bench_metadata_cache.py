@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark full rebuilds with a cold vs warm metadata cache.
+
+Runs full rebuilds without the cache, with an empty cache, and with the
+cache populated by the previous run, on this repository and on a synthetic
+one (default 20k files with one-line frontmatter, see bench_incremental,
+where parsing is cheap and the cache gains least). The resulting ``nodes``
+tables must be identical.
+
+Usage:
+    python -m scripts.benchmarks.bench_metadata_cache [--files 20000] [--jobs 1]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from scripts.benchmarks.bench_incremental import RULES_PATH, generate_repo
+from scripts.lib.rebuild import rebuild_index
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def nodes(db_path: str) -> list:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT * FROM nodes ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def run(repo: str, work_dir: str, jobs: int) -> bool:
+    """Time the three rebuilds; return whether their nodes match."""
+    os.makedirs(work_dir)
+    cache_path = os.path.join(work_dir, "metadata-cache.db")
+    results = []
+    for label, cache in (("no cache", None), ("cold cache", cache_path), ("warm cache", cache_path)):
+        db_path = os.path.join(work_dir, f"{label.replace(' ', '-')}.db")
+        start = time.perf_counter()
+        stats = rebuild_index(
+            repo_root=repo, db_path=db_path, rules_path=RULES_PATH, jobs=jobs, cache_path=cache
+        )
+        elapsed = time.perf_counter() - start
+        lookups = stats.cache_hits + stats.cache_misses
+        rate = stats.cache_hits / lookups if lookups else 0.0
+        print(f"  {label:<11} {elapsed:8.3f}s  hit rate {rate:5.0%}")
+        results.append(nodes(db_path))
+    return results[0] == results[1] == results[2]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="docgen-cache-bench-")
+    try:
+        synthetic = os.path.join(root, "synthetic")
+        generate_repo(synthetic, args.files)
+        for name, repo in (("this repo", REPO_ROOT), (f"synthetic {args.files:,}", synthetic)):
+            print(name)
+            if not run(repo, os.path.join(root, name.replace(" ", "-")), args.jobs):
+                print("MISMATCH: nodes differ between runs", file=sys.stderr)
+                return 1
+    finally:
+        shutil.rmtree(root)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
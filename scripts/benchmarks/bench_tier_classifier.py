@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark compiled tier classification against the per-pattern loop.
+
+Classifies a synthetic list of repository paths with ``CompiledTierRules``
+and with a per-pattern ``fnmatch`` loop (the evaluation strategy
+``classify_tier`` used before rules were compiled), checks both agree, and
+reports the speedup.
+
+Usage:
+    python -m scripts.benchmarks.bench_tier_classifier [--paths 500000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from fnmatch import fnmatch
+
+from scripts.lib.tier_classifier import CompiledTierRules, load_tier_rules
+
+RULES_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "docs", "_docgen", "tier-rules.yaml"
+)
+
+_DIRS = [
+    "backend", "frontend", "infra", "shared", "src", "lib", "handlers",
+    "components", "docs", "stories", "epics", "adr", ".claude", "skills",
+    "hooks", "agents", "node_modules", "dist", "types", "utils", "tests",
+]
+_FILES = [
+    "index.ts", "handler.ts", "handler.test.ts", "App.tsx", "README.md",
+    "package.json", "tsconfig.json", "tsconfig.build.json", "types.d.ts",
+    "jest.config.ts", "story-1-1.md", "SKILL.md", "CLAUDE.md", "logo.png",
+    "utils.js", "schema.py", "ci.yml", "notes.md", "data.json",
+]
+
+
+def synthetic_paths(count: int, seed: int = 0) -> list:
+    """Generate ``count`` plausible repository-relative paths."""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        depth = rng.randint(0, 6)
+        segments = [rng.choice(_DIRS) for _ in range(depth)]
+        segments.append(rng.choice(_FILES))
+        paths.append("/".join(segments))
+    return paths
+
+
+def per_pattern_classify(rel: str, tier_rules: dict) -> int:
+    """Classify by looping over every rule with fnmatch."""
+    tier_4 = tier_rules.get("tier_4", {})
+    parts = rel.split("/")
+    for directory in tier_4.get("directories", []):
+        if directory in parts:
+            return 4
+    _, ext = os.path.splitext(rel)
+    if ext in tier_4.get("extensions", []):
+        return 4
+    filename = os.path.basename(rel)
+    if filename in tier_4.get("files", []) or rel in tier_4.get("files", []):
+        return 4
+    for pattern in tier_rules.get("tier_1", []):
+        if _per_pattern_match(rel, pattern):
+            return 1
+    for pattern in tier_rules.get("tier_2", []):
+        if _per_pattern_match(rel, pattern):
+            return 2
+    return 3
+
+
+def _per_pattern_match(path: str, pattern: str) -> bool:
+    if pattern.startswith("**/"):
+        suffix = pattern[3:]
+        segments = path.split("/")
+        for i in range(len(segments)):
+            if fnmatch("/".join(segments[i:]), suffix):
+                return True
+        return False
+    if "**" in pattern:
+        parts = pattern.split("**")
+        if len(parts) == 2:
+            prefix = parts[0].rstrip("/")
+            suffix = parts[1].lstrip("/")
+            if prefix and not path.startswith(prefix):
+                return False
+            if not suffix:
+                return path.startswith(prefix) if prefix else True
+            remaining = path[len(prefix):].lstrip("/") if prefix else path
+            segments = remaining.split("/")
+            for i in range(len(segments)):
+                if fnmatch("/".join(segments[i:]), suffix):
+                    return True
+            return False
+    return fnmatch(path, pattern) or fnmatch(os.path.basename(path), pattern)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=500_000)
+    args = parser.parse_args()
+
+    tier_rules = load_tier_rules(RULES_PATH)
+    paths = synthetic_paths(args.paths)
+
+    start = time.perf_counter()
+    baseline = [per_pattern_classify(p, tier_rules) for p in paths]
+    baseline_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_rules = CompiledTierRules(tier_rules)
+    compiled = [compiled_rules.classify(p) for p in paths]
+    compiled_s = time.perf_counter() - start
+
+    if baseline != compiled:
+        mismatches = sum(1 for a, b in zip(baseline, compiled) if a != b)
+        print(f"MISMATCH: {mismatches} paths classified differently")
+        return 1
+
+    print(f"paths:        {len(paths)}")
+    print(f"per-pattern:  {baseline_s:8.3f}s  ({len(paths) / baseline_s:,.0f} paths/s)")
+    print(f"compiled:     {compiled_s:8.3f}s  ({len(paths) / compiled_s:,.0f} paths/s)")
+    print(f"speedup:      {baseline_s / compiled_s:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark token estimator accuracy and throughput on this repository.
+
+Runs every registered estimator over the repo's tracked ``.md``, ``.ts``
+and ``.json`` files and reports, per content kind, the mean absolute
+relative error and aggregate ratio against the BPE count, plus
+throughput. The BPE backend is timed with a cold cache.
+
+Usage:
+    python -m scripts.benchmarks.bench_token_estimator [--repo-root PATH]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from scripts.lib.token_estimator import ESTIMATORS, BpeEstimator, content_kind
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_files(repo_root: str) -> dict:
+    """Return {kind: [content, ...]} for tracked .md/.ts/.json files."""
+    paths = subprocess.run(
+        ["git", "ls-files", "*.md", "*.ts", "*.json"],
+        cwd=repo_root, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    files = {}
+    for path in paths:
+        try:
+            with open(os.path.join(repo_root, path), encoding="utf-8") as f:
+                files.setdefault(content_kind(path), []).append(f.read())
+        except (OSError, UnicodeDecodeError):
+            continue
+    return files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repo-root", default=REPO_ROOT)
+    args = parser.parse_args()
+
+    files = load_files(args.repo_root)
+    reference = BpeEstimator()
+    exact = {kind: [reference.count(c) for c in contents] for kind, contents in files.items()}
+
+    print(f"{'estimator':<10} {'kind':<6} {'files':>6} {'MB':>6} {'error':>7} {'ratio':>6} {'MB/s':>8}")
+    for name in ESTIMATORS:
+        for kind, contents in sorted(files.items()):
+            # Fresh instance so the BPE caches start cold.
+            estimator = BpeEstimator() if name == "bpe" else ESTIMATORS[name]()
+            start = time.perf_counter()
+            counts = [estimator.count(c, kind) for c in contents]
+            elapsed = time.perf_counter() - start
+
+            pairs = [(n, e) for n, e in zip(counts, exact[kind]) if e]
+            error = sum(abs(n - e) / e for n, e in pairs) / len(pairs)
+            ratio = sum(counts) / sum(exact[kind])
+            mb = sum(len(c.encode("utf-8")) for c in contents) / 1e6
+            print(f"{name:<10} {kind:<6} {len(contents):>6} {mb:>6.2f} {error:>6.1%} "
+                  f"{ratio:>6.2f} {mb / elapsed:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark the serial and parallel repository walkers.
+
+Generates a synthetic tree (default 200k files), walks it with
+``walk_repository`` at several worker counts, checks every mode yields the
+same FileInfo sequence, and reports files/sec.
+
+Usage:
+    python -m scripts.benchmarks.bench_walker [--files 200000] [--root DIR]
+        [--workers 1 4 8 16]
+
+Pass ``--root`` to walk an existing directory (e.g. a network mount)
+instead of generating one.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from scripts.lib.tier_classifier import CompiledTierRules, load_tier_rules, walk_repository
+
+RULES_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "docs", "_docgen", "tier-rules.yaml"
+)
+
+_FILE_NAMES = ["index.ts", "handler.ts", "handler.test.ts", "README.md", "types.d.ts",
+               "utils.js", "config.json", "notes.md", "logo.png", "schema.py"]
+
+
+def generate_tree(root: str, file_count: int, fanout: int = 10, per_dir: int = 20) -> None:
+    """Create ``file_count`` empty files spread across a balanced directory tree."""
+    created = 0
+    dir_index = 0
+    while created < file_count:
+        # Directory path from the base-``fanout`` digits of dir_index
+        digits = []
+        n = dir_index
+        while True:
+            digits.append(f"d{n % fanout}")
+            n //= fanout
+            if n == 0:
+                break
+        directory = os.path.join(root, "pkg", *reversed(digits))
+        os.makedirs(directory, exist_ok=True)
+        for i in range(min(per_dir, file_count - created)):
+            name = f"{i}-{_FILE_NAMES[i % len(_FILE_NAMES)]}"
+            open(os.path.join(directory, name), "w").close()
+            created += 1
+        dir_index += 1
+    # A pruned directory the walker must never enter
+    os.makedirs(os.path.join(root, "node_modules", "pkg"), exist_ok=True)
+    open(os.path.join(root, "node_modules", "pkg", "index.js"), "w").close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--root", help="Walk this directory instead of a generated tree")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    rules = CompiledTierRules(load_tier_rules(RULES_PATH))
+    root = args.root
+    generated = root is None
+    if generated:
+        root = tempfile.mkdtemp(prefix="docgen-walk-bench-")
+        start = time.perf_counter()
+        generate_tree(root, args.files)
+        print(f"generated {args.files} files in {time.perf_counter() - start:.1f}s")
+
+    try:
+        reference = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = list(walk_repository(root, rules, workers=workers))
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference = result
+            elif result != reference:
+                print(f"MISMATCH: workers={workers} output differs from workers={args.workers[0]}")
+                return 1
+            print(f"workers={workers:<3d} {elapsed:8.3f}s  ({len(result) / elapsed:,.0f} files/s)")
+    finally:
+        if generated:
+            shutil.rmtree(root)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark decoded str.split() word counting against the mmap byte scanner.
+
+Writes synthetic UTF-8 files from 1 KB to 100 MB, either plain ASCII or
+mixed (non-ASCII letters and Unicode spaces such as U+3000, which take the
+slower regex pass), and counts words both ways. Throughput is timed on its
+own; peak Python heap is measured in a second run under tracemalloc (mmap
+pages are file-backed and not included). Counts must match.
+
+Usage:
+    python -m scripts.benchmarks.bench_word_count [--sizes 1K,100K,1M,10M,100M]
+        [--content ascii,mixed]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from scripts.lib.token_estimator import count_words_in_file
+
+UNITS = {"K": 1 << 10, "M": 1 << 20}
+CONTENT = {
+    "ascii": (["the", "index", "rebuild", "frontmatter", "tier", "{", "});"], [" "] * 12 + ["\n", "\t"]),
+    "mixed": (
+        ["the", "index", "d\u00e9j\u00e0", "na\u00efve", "\u65e5\u672c\u8a9e", "tier", "{", "});"],
+        [" "] * 12 + ["\n", "\t", "\u00a0", "\u3000"],
+    ),
+}
+
+
+def parse_size(text: str) -> int:
+    return int(text[:-1]) * UNITS[text[-1]] if text[-1] in UNITS else int(text)
+
+
+def write_file(path: str, size: int, content: str, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    words, spaces = CONTENT[content]
+    block = "".join(rng.choice(words) + rng.choice(spaces) for _ in range(20_000)).encode("utf-8")
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            piece = block[: size - written]
+            # Do not end on a partial character.
+            piece = piece.decode("utf-8", "ignore").encode("utf-8")
+            if not piece:
+                break
+            f.write(piece)
+            written += len(piece)
+
+
+def split_count(path: str) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        return len(f.read().split())
+
+
+def measure(fn, path: str) -> tuple:
+    """Return (result, seconds, peak traced bytes)."""
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1K,100K,1M,10M,100M")
+    parser.add_argument("--content", default="ascii,mixed")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="docgen-wordcount-bench-")
+    try:
+        print(f"{'content':<7} {'size':>6} {'split MB/s':>11} {'split peak':>11} "
+              f"{'mmap MB/s':>10} {'mmap peak':>10}")
+        runs = [(c, label) for c in args.content.split(",") for label in args.sizes.split(",")]
+        for content, label in runs:
+            path = os.path.join(root, f"{content}-{label}.txt")
+            write_file(path, parse_size(label), content)
+            mb = os.path.getsize(path) / 1e6
+
+            base, base_s, base_peak = measure(split_count, path)
+            fast, fast_s, fast_peak = measure(count_words_in_file, path)
+            if base != fast:
+                print(f"MISMATCH at {content} {label}: {base} != {fast}", file=sys.stderr)
+                return 1
+            print(f"{content:<7} {label:>6} {mb / base_s:>11.1f} {base_peak / 1e6:>9.1f}MB "
+                  f"{mb / fast_s:>10.1f} {fast_peak / 1e6:>8.1f}MB")
+    finally:
+        shutil.rmtree(root)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
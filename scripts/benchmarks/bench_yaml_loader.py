@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the C and pure-Python YAML safe loaders.
+
+Loads every frontmatter block in the repository plus tier-rules.yaml with
+``yaml.CSafeLoader`` (when available) and ``yaml.SafeLoader``, and reports
+time per pass and the speedup.
+
+Usage:
+    python -m scripts.benchmarks.bench_yaml_loader [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import yaml
+
+from scripts.lib.metadata_parser import MAX_FRONTMATTER_SIZE, _scan_frontmatter
+from scripts.lib.tier_classifier import load_tier_rules, walk_repository
+from scripts.lib.yaml_loader import HAS_LIBYAML
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+RULES_PATH = os.path.join(REPO_ROOT, "docs", "_docgen", "tier-rules.yaml")
+
+
+def collect_documents() -> list:
+    """YAML texts to load: repo frontmatter blocks plus tier-rules.yaml."""
+    docs = []
+    for fi in walk_repository(REPO_ROOT, load_tier_rules(RULES_PATH)):
+        if not fi.relative_path.endswith(".md"):
+            continue
+        try:
+            with open(fi.path, "r", encoding="utf-8") as f:
+                text = _scan_frontmatter(f, fi.path, MAX_FRONTMATTER_SIZE)
+        except (OSError, UnicodeDecodeError):
+            continue
+        if text is not None:
+            docs.append(text)
+    with open(RULES_PATH) as f:
+        docs.append(f.read())
+    return docs
+
+
+def time_loader(loader, docs: list, repeat: int) -> float:
+    """Seconds per pass loading every document with ``loader``."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in docs:
+            try:
+                yaml.load(text, Loader=loader)
+            except yaml.YAMLError:
+                pass
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    docs = collect_documents()
+    total = sum(len(d) for d in docs)
+    print(f"documents:    {len(docs)} ({total:,} characters)")
+
+    python_s = time_loader(yaml.SafeLoader, docs, args.repeat)
+    print(f"SafeLoader:   {python_s * 1000:8.2f} ms/pass")
+    if not HAS_LIBYAML:
+        print("CSafeLoader:  unavailable (PyYAML built without libyaml)")
+        return 0
+
+    c_s = time_loader(yaml.CSafeLoader, docs, args.repeat)
+    print(f"CSafeLoader:  {c_s * 1000:8.2f} ms/pass")
+    print(f"speedup:      {python_s / c_s:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""Token budget packing for topic split proposals.
+
+Partitions an expanded file set into as few subtopics as possible such
+that each subtopic's summed ``token_estimate`` fits the archetype budget
+(``source_budget_ratio * total_words``). Files that share a Tier 1 anchor
+form an affinity group and are always placed in the same subtopic.
+
+Two modes:
+
+- ``greedy``: best-fit decreasing over affinity groups, O(n log n).
+- ``exact``: branch and bound seeded with the greedy result, bounded by a
+  node limit. ``Partition.optimal`` says whether optimality was proven
+  (either by reaching the lower bound or by exhausting the search). Each
+  search node costs O(open bins), so the limit matters most for large sets.
+"""
+
+import math
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+DEFAULT_MAX_NODES = 50_000
+
+
+@dataclass
+class Partition:
+    """Subtopic assignment produced by ``pack_files``."""
+
+    budget: int
+    bins: list = field(default_factory=list)  # Sorted file lists, one per subtopic
+    tokens: list = field(default_factory=list)  # Token total per bin
+    lower_bound: int = 0  # No valid partition can use fewer bins
+    optimal: bool = False  # len(bins) proven minimal
+    oversized: list = field(default_factory=list)  # Bin indexes over budget on their own
+
+    @property
+    def fits_budget(self) -> bool:
+        return not self.oversized
+
+
+def compute_budget(archetype: dict) -> int:
+    """Source token budget for an archetype: ``source_budget_ratio * total_words``."""
+    return int(archetype["source_budget_ratio"] * archetype["total_words"])
+
+
+def affinity_groups(files: Iterable[str], affinity: Optional[dict] = None) -> list:
+    """Merge files that share an anchor key into groups.
+
+    Args:
+        files: File ids to group.
+        affinity: File id -> iterable of anchor keys (e.g. the Tier 1 files
+            it belongs to). Files sharing any key end up in one group;
+            grouping is transitive.
+
+    Returns:
+        Sorted list of sorted file lists.
+    """
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for f in files:
+        parent.setdefault(("file", f), ("file", f))
+    for f, keys in (affinity or {}).items():
+        node = ("file", f)
+        if node not in parent:
+            continue
+        for key in keys:
+            anchor = ("anchor", key)
+            parent.setdefault(anchor, anchor)
+            a, b = find(node), find(anchor)
+            if a != b:
+                parent[b] = a
+
+    groups = {}
+    for node in parent:
+        if node[0] == "file":
+            groups.setdefault(find(node), []).append(node[1])
+    return sorted(sorted(g) for g in groups.values())
+
+
+def tier1_affinity(graph, files: Iterable[str], tier1: Iterable[str]) -> dict:
+    """Map each file to the Tier 1 anchors it is directly connected to.
+
+    A Tier 1 file anchors itself. Only anchors inside ``files`` count.
+
+    Args:
+        graph: ``RepoGraph`` for the index.
+        files: Expanded file set.
+        tier1: Ids of Tier 1 nodes.
+    """
+    files = set(files)
+    anchors = files.intersection(tier1)
+    affinity = {}
+    for f in files:
+        keys = {f} if f in anchors else set()
+        for edge_type in graph.edge_types:
+            for incoming in (False, True):
+                keys.update(a for a in graph.neighbors(f, edge_type, incoming) if a in anchors)
+        if keys:
+            affinity[f] = sorted(keys)
+    return affinity
+
+
+def lower_bound(sizes: list, capacity: int) -> int:
+    """Martello-Toth L2 lower bound on the number of bins.
+
+    Args:
+        sizes: Item sizes, each ``<= capacity``.
+        capacity: Bin capacity.
+    """
+    if not sizes:
+        return 0
+    if capacity <= 0:
+        return len(sizes)
+    ordered = sorted(sizes)
+    prefix = [0]
+    for s in ordered:
+        prefix.append(prefix[-1] + s)
+    n = len(ordered)
+    best = math.ceil(prefix[-1] / capacity)
+    half_idx = bisect_left(ordered, capacity / 2 + 1e-9)  # first item > C/2
+    # J2 items (> C/2) that do not fall in J1 for a given alpha
+    candidates = {0, *ordered[:half_idx]}
+    for alpha in candidates:
+        j1_start = bisect_left(ordered, capacity - alpha + 1e-9)  # items > C - alpha
+        j1 = n - j1_start
+        j2_start = max(half_idx, 0)
+        j2_count = max(j1_start - j2_start, 0)
+        j2_sum = prefix[j1_start] - prefix[j2_start] if j2_count else 0
+        j3_start = bisect_left(ordered, alpha)
+        j3_sum = prefix[half_idx] - prefix[j3_start] if half_idx > j3_start else 0
+        spare = j2_count * capacity - j2_sum
+        bound = j1 + j2_count + max(0, math.ceil((j3_sum - spare) / capacity))
+        best = max(best, bound)
+    return best
+
+
+def _best_fit_decreasing(sizes: list, capacity: int) -> list:
+    """Bin index per item; ``sizes`` must already be in decreasing order."""
+    free = []  # sorted (remaining, bin_index)
+    assignment = []
+    bins = 0
+    for s in sizes:
+        pos = bisect_left(free, (s, -1))
+        if pos < len(free):
+            remaining, index = free.pop(pos)
+        else:
+            remaining, index = capacity, bins
+            bins += 1
+        assignment.append(index)
+        insort(free, (remaining - s, index))
+    return assignment
+
+
+def _branch_and_bound(sizes: list, capacity: int, incumbent: list, bound: int,
+                      max_nodes: int) -> tuple:
+    """Depth-first search for a partition with fewer bins than ``incumbent``.
+
+    Items are placed in decreasing size order into an open bin or a new
+    one; bins with equal remaining capacity are tried once per level.
+
+    Returns:
+        (assignment, proven_optimal)
+    """
+    n = len(sizes)
+    best = max(incumbent) + 1
+    best_assignment = incumbent
+    if best <= bound:
+        return best_assignment, True
+
+    suffix = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix[i] = suffix[i + 1] + sizes[i]
+
+    caps = []  # remaining capacity per open bin
+    free_total = 0  # sum(caps)
+    choice = [-1] * n
+    opened = [False] * n  # choice[i] was a new bin
+    next_j = [0] * n
+    seen = [None] * n
+    seen[0] = set()
+    i = 0
+    nodes = 0
+    while i >= 0:
+        if i == n:
+            best = len(caps)
+            best_assignment = choice[:]
+            if best <= bound:
+                return best_assignment, True
+            i -= 1
+            continue
+
+        # Undo this level's previous placement before trying the next one.
+        j = choice[i]
+        if j >= 0:
+            if opened[i]:
+                caps.pop()
+                free_total -= capacity - sizes[i]
+            else:
+                caps[j] += sizes[i]
+                free_total += sizes[i]
+            choice[i] = -1
+
+        s = sizes[i]
+        placed = False
+        j = next_j[i]
+        while j <= len(caps):
+            if j == len(caps):
+                new_bin = True
+                if len(caps) + 1 >= best:
+                    j += 1
+                    break
+            else:
+                new_bin = False
+                if caps[j] < s or caps[j] in seen[i]:
+                    j += 1
+                    continue
+                seen[i].add(caps[j])
+            open_bins = len(caps) + new_bin
+            free = free_total + (capacity if new_bin else 0) - s
+            if open_bins + max(0, math.ceil((suffix[i + 1] - free) / capacity)) >= best:
+                j += 1
+                continue
+            if new_bin:
+                caps.append(capacity - s)
+            else:
+                caps[j] -= s
+            free_total = free
+            choice[i] = j
+            opened[i] = new_bin
+            next_j[i] = j + 1
+            placed = True
+            break
+
+        if not placed:
+            next_j[i] = 0
+            i -= 1
+            continue
+
+        nodes += 1
+        if nodes >= max_nodes:
+            return best_assignment, False
+        i += 1
+        if i < n:
+            next_j[i] = 0
+            seen[i] = set()
+            choice[i] = -1
+
+    return best_assignment, True
+
+
+def pack_files(
+    tokens: dict,
+    budget: int,
+    affinity: Optional[dict] = None,
+    mode: str = "greedy",
+    max_nodes: int = DEFAULT_MAX_NODES,
+) -> Partition:
+    """Partition files into the fewest subtopics that fit ``budget``.
+
+    Args:
+        tokens: File id -> token estimate (None counts as 0).
+        budget: Token budget per subtopic.
+        affinity: File id -> anchor keys; see ``affinity_groups``.
+        mode: ``"greedy"`` or ``"exact"``.
+        max_nodes: Search node limit for exact mode.
+
+    Returns:
+        Partition. Affinity groups that alone exceed the budget get a bin
+        each and are listed in ``oversized``; they cannot be fixed by
+        packing and need a finer split strategy.
+    """
+    if mode not in ("greedy", "exact"):
+        raise ValueError(f"Unknown packing mode: {mode!r}")
+
+    items = []
+    oversized = []
+    for group in affinity_groups(tokens, affinity):
+        size = sum(tokens[f] or 0 for f in group)
+        (oversized if size > budget else items).append((size, group))
+    items.sort(key=lambda item: (-item[0], item[1]))
+    sizes = [size for size, _ in items]
+
+    bound = lower_bound(sizes, budget)
+    assignment = _best_fit_decreasing(sizes, budget)
+    optimal = (max(assignment, default=-1) + 1) <= bound
+    if mode == "exact" and not optimal:
+        assignment, optimal = _branch_and_bound(sizes, budget, assignment, bound, max_nodes)
+
+    bins = [[] for _ in range(max(assignment, default=-1) + 1)]
+    totals = [0] * len(bins)
+    for (size, group), index in zip(items, assignment):
+        bins[index].extend(group)
+        totals[index] += size
+
+    partition = Partition(budget=budget, lower_bound=bound + len(oversized), optimal=optimal)
+    for size, group in sorted(oversized, key=lambda item: (-item[0], item[1])):
+        partition.oversized.append(len(partition.bins))
+        partition.bins.append(group)
+        partition.tokens.append(size)
+    for files, total in sorted(zip(bins, totals), key=lambda b: (-b[1], b[0])):
+        partition.bins.append(sorted(files))
+        partition.tokens.append(total)
+    return partition
@@ -0,0 +1,193 @@
+"""Single-read file ingestion for the repository index.
+
+Reads each file from disk exactly once and derives every per-file value the
+index needs (frontmatter, JSON config metadata, token estimate, content
+hash, and modification time) from that one buffer.
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable, Optional
+
+from scripts.lib.metadata_cache import MetadataCache, cache_variant
+from scripts.lib.metadata_parser import (
+    format_timestamp,
+    parse_frontmatter_content,
+    parse_json_config_content,
+)
+from scripts.lib.tier_classifier import FileInfo
+from scripts.lib.token_estimator import (
+    DEFAULT_ESTIMATOR,
+    content_kind,
+    estimate_tokens_from_text,
+)
+
+logger = logging.getLogger(__name__)
+
+# Files per task sent to a worker process; large enough to amortize pickling
+# FileInfo/FileRecord across the process boundary.
+DEFAULT_BATCH_SIZE = 256
+
+
+@dataclass
+class FileRecord:
+    """Per-file values derived from a single read of the file."""
+
+    path: str  # Path as passed to ingest_file()
+    size: int  # Size in bytes
+    mtime_ns: int  # Modification time in nanoseconds since the epoch
+    inode: int  # Inode number (st_ino)
+    last_modified: str  # Modification time as ISO 8601 UTC
+    content_hash: str  # SHA-256 hex digest of the raw bytes
+    frontmatter: Optional[dict]  # Parsed YAML frontmatter, if any
+    json_metadata: Optional[dict]  # Extracted config metadata for .json files
+    token_estimate: int  # 0 for binary/undecodable files
+    cache_hit: bool = False  # Parsed values came from the metadata cache
+
+
+def ingest_file(
+    file_path: str,
+    estimator: str = DEFAULT_ESTIMATOR,
+    cache: Optional[MetadataCache] = None,
+) -> Optional[FileRecord]:
+    """Read a file once and derive all of its index metadata.
+
+    Results match calling ``parse_frontmatter``, ``parse_json_config``
+    (for ``.json`` files), ``estimate_tokens`` and ``get_last_modified``
+    separately. Content is decoded as UTF-8 with universal newlines, as
+    text-mode ``open()`` would. With a ``cache``, files whose content hash
+    is cached skip decoding and parsing entirely.
+
+    Args:
+        file_path: Path to the file.
+        estimator: Token estimator name (see ``token_estimator``).
+        cache: Metadata cache to look parsed values up in.
+
+    Returns:
+        FileRecord for the file, or None if it could not be read.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            data = f.read()
+    except OSError as exc:
+        logger.warning("Could not read %s: %s", file_path, exc)
+        return None
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    cached = cache.lookup(content_hash, cache_variant(file_path, estimator)) if cache else None
+    if cached is not None:
+        frontmatter, json_metadata, token_estimate = cached
+    else:
+        frontmatter = None
+        json_metadata = None
+        token_estimate = 0
+        content = _decode(data)
+        if content is not None:
+            frontmatter = parse_frontmatter_content(content, file_path)
+            if file_path.endswith(".json"):
+                json_metadata = parse_json_config_content(content, file_path)
+            token_estimate = estimate_tokens_from_text(content, content_kind(file_path), estimator)
+
+    return FileRecord(
+        path=file_path,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        inode=st.st_ino,
+        last_modified=format_timestamp(st.st_mtime),
+        content_hash=content_hash,
+        frontmatter=frontmatter,
+        json_metadata=json_metadata,
+        token_estimate=token_estimate,
+        cache_hit=cached is not None,
+    )
+
+
+def ingest_files(
+    file_infos: Iterable[FileInfo],
+    jobs: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    estimator: str = DEFAULT_ESTIMATOR,
+    cache: Optional[MetadataCache] = None,
+) -> list:
+    """Ingest many files, optionally across a process pool.
+
+    YAML parsing is CPU-bound and serialized by the GIL, so with ``jobs > 1``
+    the files are split into batches of ``batch_size`` and ingested in
+    worker processes. Unreadable files are logged and omitted. With a
+    ``cache``, workers look entries up through their own read-only
+    connection and new results are staged in ``cache`` by this process.
+
+    Args:
+        file_infos: Files to ingest, e.g. from ``walk_repository()``.
+        jobs: Number of worker processes. 1 ingests in-process.
+        batch_size: Files per worker task.
+        estimator: Token estimator name.
+        cache: Metadata cache to read from and stage new entries in.
+
+    Returns:
+        List of (FileInfo, FileRecord) tuples sorted by relative_path,
+        identical for any ``jobs`` value.
+    """
+    file_infos = list(file_infos)
+    if cache is not None:
+        cache.flush()  # Make staged entries visible to worker connections
+    if jobs > 1 and len(file_infos) > batch_size:
+        batches = [
+            file_infos[i:i + batch_size]
+            for i in range(0, len(file_infos), batch_size)
+        ]
+        ingest_batch = partial(
+            _ingest_batch_worker,
+            estimator=estimator,
+            cache_path=cache.path if cache is not None else None,
+        )
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = [pair for batch in pool.map(ingest_batch, batches) for pair in batch]
+    else:
+        results = _ingest_batch(file_infos, estimator, cache)
+
+    results.sort(key=lambda pair: pair[0].relative_path)
+    if cache is not None:
+        for file_info, record in results:
+            cache.record(record, cache_variant(file_info.path, estimator))
+    return results
+
+
+def _ingest_batch(file_infos: list, estimator: str, cache: Optional[MetadataCache]) -> list:
+    """Ingest a batch, dropping files that could not be read."""
+    results = []
+    for file_info in file_infos:
+        record = ingest_file(file_info.path, estimator, cache)
+        if record is not None:
+            results.append((file_info, record))
+    return results
+
+
+# Read-only cache connection per worker process, keyed by cache path.
+_worker_caches = {}
+
+
+def _ingest_batch_worker(file_infos: list, estimator: str, cache_path: Optional[str]) -> list:
+    """Worker task: ``_ingest_batch`` with this process's read-only cache."""
+    cache = None
+    if cache_path is not None:
+        cache = _worker_caches.get(cache_path)
+        if cache is None:
+            cache = _worker_caches[cache_path] = MetadataCache(cache_path, readonly=True)
+    return _ingest_batch(file_infos, estimator, cache)
+
+
+def _decode(data: bytes) -> Optional[str]:
+    """Decode bytes as UTF-8 with universal newlines, or None if binary."""
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
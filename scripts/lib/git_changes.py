@@ -0,0 +1,111 @@
+"""Change detection from git for incremental rebuilds.
+
+Instead of walking and stat-ing the whole tree, an incremental rebuild can
+ask git which paths differ from the commit the index was last built at.
+The candidate set for a run is:
+
+- paths changed between that commit and the working tree
+  (``git diff --name-status``, which covers commits, staged and unstaged
+  edits, deletions, and both sides of renames),
+- untracked, non-ignored files (``git ls-files --others``), and
+- paths that were dirty at the previous run, since reverting an
+  uncommitted edit makes a file match the commit again while the index
+  still holds the edited content.
+
+Files ignored by git are invisible to this mode; the walker indexes them
+unless tier-rules.yaml excludes them, so run a walk-based rebuild if
+ignored files matter.
+"""
+
+import subprocess
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+
+@dataclass
+class GitChanges:
+    """Paths to re-check, relative to the repository root."""
+
+    commit: str  # HEAD when the changes were read
+    changed: set = field(default_factory=set)  # Candidates for this run
+    dirty: set = field(default_factory=set)  # Differ from HEAD in the working tree
+
+
+def _git(repo_root: str, *args: str) -> Optional[str]:
+    """Run git in ``repo_root``; None if git is missing or the command fails."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", repo_root, *args],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+        )
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _split_paths(output: str) -> set:
+    return {path for path in output.split("\0") if path}
+
+
+def _diff_paths(repo_root: str, commit: str) -> Optional[set]:
+    """Paths that differ between ``commit`` and the working tree."""
+    # --no-renames reports a rename as a delete plus an add; the rebuild
+    # re-pairs them by content hash. Every other -z record is "STATUS\0path".
+    output = _git(
+        repo_root, "diff", "--name-status", "--no-renames", "--no-ext-diff",
+        "--relative", "-z", commit, "--",
+    )
+    if output is None:
+        return None
+    fields = output.split("\0")
+    return {path for path in fields[1::2] if path}
+
+
+def head_commit(repo_root: str) -> Optional[str]:
+    """Commit hash of HEAD, or None outside a git work tree or before the first commit."""
+    output = _git(repo_root, "rev-parse", "--verify", "--quiet", "HEAD^{commit}")
+    return output.strip() if output else None
+
+
+def read_changes(
+    repo_root: str, since: Optional[str] = None, previously_dirty: Iterable[str] = ()
+) -> Optional[GitChanges]:
+    """Collect the paths that may differ from an index built at ``since``.
+
+    Args:
+        repo_root: Repository (or subdirectory) root; paths are relative to it.
+        since: Commit the index was built at. None only computes the
+            current HEAD and dirty set, e.g. to record after a full rebuild.
+        previously_dirty: ``GitChanges.dirty`` recorded by the previous run.
+
+    Returns:
+        GitChanges, or None if git cannot answer (not a repository, git not
+        installed, or ``since`` no longer exists, e.g. after a history
+        rewrite); callers should fall back to walking the tree.
+    """
+    commit = head_commit(repo_root)
+    if commit is None:
+        return None
+
+    dirty = _diff_paths(repo_root, commit)
+    untracked = _git(repo_root, "ls-files", "--others", "--exclude-standard", "-z")
+    if dirty is None or untracked is None:
+        return None
+    dirty |= _split_paths(untracked)
+
+    changes = GitChanges(commit=commit, dirty=dirty)
+    if since is None:
+        return changes
+    if since == commit:
+        committed = set()
+    else:
+        if _git(repo_root, "cat-file", "-e", f"{since}^{{commit}}") is None:
+            return None
+        committed = _diff_paths(repo_root, since)
+        if committed is None:
+            return None
+    changes.changed = committed | dirty | set(previously_dirty)
+    return changes
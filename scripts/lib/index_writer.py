@@ -0,0 +1,129 @@
+"""Batched writer for the repository index tables.
+
+Stages ``nodes``, ``edges`` and ``file_manifest`` rows in memory and writes
+them with ``executemany`` in explicit transactions, instead of one
+autocommitted INSERT per row.
+"""
+
+import sqlite3
+
+# Staged rows per transaction
+DEFAULT_BATCH_SIZE = 50_000
+
+UPSERT_NODE_SQL = (
+    "INSERT INTO nodes "
+    "(id, tier, type, name, token_estimate, frontmatter, last_modified) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET tier = excluded.tier, type = excluded.type, "
+    "name = excluded.name, token_estimate = excluded.token_estimate, "
+    "frontmatter = excluded.frontmatter, last_modified = excluded.last_modified"
+)
+
+INSERT_EDGE_SQL = (
+    "INSERT OR IGNORE INTO edges (source_id, target_id, edge_type) VALUES (?, ?, ?)"
+)
+
+UPSERT_MANIFEST_SQL = (
+    "INSERT OR REPLACE INTO file_manifest "
+    "(path, size, mtime_ns, inode, content_hash) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+class IndexWriter:
+    """Stage index rows and flush them in batched transactions.
+
+    Each flush writes staged nodes before staged edges and manifest rows, so
+    foreign keys are satisfied as long as every node is staged no later than
+    the edges that reference it. Every flush commits.
+
+    With ``bulk=True`` (intended for full rebuilds, where a crash just means
+    rebuilding again), durability is traded for speed with
+    ``PRAGMA synchronous = OFF`` and ``temp_store = MEMORY`` while the writer
+    is open, and ``ANALYZE`` runs on close so the query planner has fresh
+    statistics.
+
+    Usage::
+
+        with IndexWriter(conn, bulk=True) as writer:
+            writer.add_node(row)
+            writer.add_edge(source_id, target_id, edge_type)
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        bulk: bool = False,
+    ):
+        self._conn = conn
+        self._batch_size = batch_size
+        self._bulk = bulk
+        self._nodes = []
+        self._edges = []
+        self._manifest = []
+        self._saved_pragmas = {}
+        self.nodes_written = 0
+        self.edges_written = 0
+
+        if bulk:
+            for pragma, value in (("synchronous", "OFF"), ("temp_store", "MEMORY")):
+                self._saved_pragmas[pragma] = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+                conn.execute(f"PRAGMA {pragma} = {value}")
+
+    def __enter__(self) -> "IndexWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._nodes.clear()
+            self._edges.clear()
+            self._manifest.clear()
+            self._restore_pragmas()
+
+    def add_node(self, row: tuple) -> None:
+        """Stage a node row (id, tier, type, name, token_estimate, frontmatter, last_modified)."""
+        self._nodes.append(row)
+        self._maybe_flush()
+
+    def add_edge(self, source_id: str, target_id: str, edge_type: str) -> None:
+        """Stage an edge; duplicates of existing edges are ignored."""
+        self._edges.append((source_id, target_id, edge_type))
+        self._maybe_flush()
+
+    def add_manifest(self, row: tuple) -> None:
+        """Stage a file_manifest row (path, size, mtime_ns, inode, content_hash)."""
+        self._manifest.append(row)
+        self._maybe_flush()
+
+    def flush(self) -> None:
+        """Write all staged rows in one transaction."""
+        if not (self._nodes or self._edges or self._manifest):
+            return
+        with self._conn:
+            self._conn.executemany(UPSERT_NODE_SQL, self._nodes)
+            self._conn.executemany(INSERT_EDGE_SQL, self._edges)
+            self._conn.executemany(UPSERT_MANIFEST_SQL, self._manifest)
+        self.nodes_written += len(self._nodes)
+        self.edges_written += len(self._edges)
+        self._nodes.clear()
+        self._edges.clear()
+        self._manifest.clear()
+
+    def close(self) -> None:
+        """Flush remaining rows; in bulk mode, ANALYZE and restore pragmas."""
+        self.flush()
+        if self._bulk:
+            self._conn.execute("ANALYZE")
+            self._conn.commit()
+        self._restore_pragmas()
+
+    def _maybe_flush(self) -> None:
+        if len(self._nodes) + len(self._edges) + len(self._manifest) >= self._batch_size:
+            self.flush()
+
+    def _restore_pragmas(self) -> None:
+        for pragma, value in self._saved_pragmas.items():
+            self._conn.execute(f"PRAGMA {pragma} = {value}")
+        self._saved_pragmas.clear()
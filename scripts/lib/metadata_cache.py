@@ -0,0 +1,202 @@
+"""Persistent content-addressed cache of per-file metadata.
+
+Stores the outputs of frontmatter parsing, JSON config extraction and
+token estimation keyed by the file's SHA-256 content hash (the same hash
+``file_manifest`` records), so rebuilds only parse files whose bytes have
+not been seen before. The cache lives in its own SQLite file, outside the
+index database, so it survives full rebuilds that replace the index.
+
+Entries are invalidated wholesale when the parser code changes:
+``PARSER_VERSION`` is a hash of the modules whose output is cached. The
+cache is capped at ``max_entries`` rows, evicting least recently used
+entries (by rebuild generation) on close.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Optional
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Modules whose code shapes the cached values.
+_PARSER_MODULES = ("metadata_parser.py", "yaml_loader.py", "token_estimator.py", "file_ingest.py")
+
+
+def _parser_version() -> str:
+    """Hash of the source of every module that shapes cached values."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in _PARSER_MODULES:
+        with open(os.path.join(os.path.dirname(__file__), name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+PARSER_VERSION = _parser_version()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata_cache (
+    content_hash TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    frontmatter TEXT,
+    json_metadata TEXT,
+    token_estimate INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (content_hash, variant)
+);
+CREATE INDEX IF NOT EXISTS idx_metadata_cache_last_used ON metadata_cache(last_used);
+"""
+
+
+def cache_variant(file_path: str, estimator: str) -> str:
+    """The non-content inputs that cached values depend on.
+
+    JSON metadata is only extracted for ``.json`` files and token estimates
+    depend on the estimator and the file's content kind, both of which
+    follow from the extension.
+    """
+    return f"{os.path.splitext(file_path)[1]}:{estimator}"
+
+
+def _dumps(value) -> Optional[str]:
+    # YAML dates and timestamps are not JSON types; the index stores them as
+    # strings anyway (see rebuild.build_node_row).
+    return None if value is None else json.dumps(value, default=str)
+
+
+def _loads(text: Optional[str]):
+    return None if text is None else json.loads(text)
+
+
+class MetadataCache:
+    """SQLite-backed metadata cache for one rebuild.
+
+    Open one per rebuild: each open starts a new LRU generation. Worker
+    processes open their own read-only instance; only the owner writes.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES, readonly: bool = False):
+        """Open (creating if needed) the cache at ``path``.
+
+        Args:
+            path: SQLite file path.
+            max_entries: LRU cap applied on ``close()``.
+            readonly: Open for lookups only, e.g. from a worker process.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+        self._pending = []
+        self._touched = []
+
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            self.generation = 0
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # A lost write only costs a re-parse, so skip per-commit fsyncs.
+        self.conn.execute("PRAGMA synchronous=OFF")
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            meta = dict(self.conn.execute("SELECT key, value FROM cache_meta"))
+            if meta.get("parser_version") != PARSER_VERSION:
+                self.conn.execute("DELETE FROM metadata_cache")
+            self.generation = int(meta.get("generation", 0)) + 1
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cache_meta (key, value) VALUES (?, ?)",
+                [("parser_version", PARSER_VERSION), ("generation", str(self.generation))],
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(self, content_hash: str, variant: str) -> Optional[tuple]:
+        """Return cached (frontmatter, json_metadata, token_estimate) or None.
+
+        Does not count towards ``hits``/``misses``; see ``record()``.
+        """
+        row = self.conn.execute(
+            "SELECT frontmatter, json_metadata, token_estimate FROM metadata_cache "
+            "WHERE content_hash = ? AND variant = ?",
+            (content_hash, variant),
+        ).fetchone()
+        if row is None:
+            return None
+        return _loads(row[0]), _loads(row[1]), row[2]
+
+    def record(self, record, variant: str) -> None:
+        """Account for an ingested FileRecord: touch it on a hit, stage it on a miss."""
+        if record.cache_hit:
+            self.hits += 1
+            self._touched.append((self.generation, record.content_hash, variant))
+        else:
+            self.misses += 1
+            self._pending.append((
+                record.content_hash,
+                variant,
+                _dumps(record.frontmatter),
+                _dumps(record.json_metadata),
+                record.token_estimate,
+                self.generation,
+            ))
+
+    def flush(self) -> None:
+        """Write staged entries and LRU touches."""
+        if self.readonly or not (self._pending or self._touched):
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metadata_cache (content_hash, variant, frontmatter, "
+                "json_metadata, token_estimate, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+            self.conn.executemany(
+                "UPDATE metadata_cache SET last_used = ? WHERE content_hash = ? AND variant = ?",
+                self._touched,
+            )
+        self._pending.clear()
+        self._touched.clear()
+
+    def evict(self) -> int:
+        """Delete least recently used entries beyond ``max_entries``.
+
+        Returns:
+            Number of entries deleted.
+        """
+        count = self.conn.execute("SELECT COUNT(*) FROM metadata_cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM metadata_cache WHERE (content_hash, variant) IN ("
+                "SELECT content_hash, variant FROM metadata_cache "
+                "ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        return excess
+
+    def close(self) -> None:
+        """Flush, apply the size cap, and close the connection."""
+        if not self.readonly:
+            self.flush()
+            self.evict()
+        self.conn.close()
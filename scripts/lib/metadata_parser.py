@@ -4,26 +4,42 @@ Extracts YAML frontmatter, JSON config metadata, human-readable names,
 last-modified timestamps, and determines frontmatter-based tier upgrades.
 """
 
+import io
 import json
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional
 
 import yaml
 
+from scripts.lib.yaml_loader import safe_load
+
 logger = logging.getLogger(__name__)
 
+# Frontmatter blocks larger than this (in characters) are treated as
+# missing rather than read to the end of the file.
+MAX_FRONTMATTER_SIZE = 256 * 1024
+
 
-def parse_frontmatter(file_path: str) -> Optional[dict]:
+def parse_frontmatter(
+    file_path: str, max_size: Optional[int] = MAX_FRONTMATTER_SIZE
+) -> Optional[dict]:
     """Extract YAML frontmatter from a markdown file.
 
     Frontmatter is delimited by ``---`` at the start of the file.
     The content between the first and second ``---`` lines is parsed
     as YAML.
 
+    The file is streamed line by line and reading stops at the closing
+    delimiter, so the body of a large document is never read. Files whose
+    first bytes cannot begin a ``---`` line are rejected after a single
+    buffered read.
+
     Args:
         file_path: Absolute or relative path to the file.
+        max_size: Give up (return None) if no closing delimiter is found
+            within this many characters. None means no limit.
 
     Returns:
         Parsed frontmatter as a dict, or None if no frontmatter found
@@ -31,36 +47,103 @@ def parse_frontmatter(file_path: str) -> Optional[dict]:
     """
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            if not _may_open_frontmatter(f.buffer.peek(4)[:4]):
+                return None
+            frontmatter_text = _scan_frontmatter(f, file_path, max_size)
     except (OSError, UnicodeDecodeError) as exc:
         logger.warning("Could not read %s: %s", file_path, exc)
         return None
 
-    lines = content.split("\n")
+    return _load_frontmatter_yaml(frontmatter_text, file_path)
 
-    # First line must be '---'
-    if not lines or lines[0].strip() != "---":
+
+def parse_frontmatter_content(
+    content: str,
+    file_path: str = "<string>",
+    max_size: Optional[int] = MAX_FRONTMATTER_SIZE,
+) -> Optional[dict]:
+    """Extract YAML frontmatter from already-decoded file content.
+
+    Same rules as ``parse_frontmatter``; use this when the file has already
+    been read for another purpose.
+
+    Args:
+        content: Decoded file content, newlines already normalized to LF.
+        file_path: Path used in log messages only.
+        max_size: Character limit for the frontmatter block, as in
+            ``parse_frontmatter``.
+
+    Returns:
+        Parsed frontmatter as a dict, or None if no frontmatter found
+        or if parsing fails.
+    """
+    if not _may_open_frontmatter(content[:4].encode("utf-8")):
         return None
+    frontmatter_text = _scan_frontmatter(io.StringIO(content), file_path, max_size)
+    return _load_frontmatter_yaml(frontmatter_text, file_path)
 
-    # Find the closing '---'
-    end_index = None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            end_index = i
-            break
 
-    if end_index is None:
+def _may_open_frontmatter(head: bytes) -> bool:
+    """Cheap check on the first bytes of a file for a possible ``---`` line.
+
+    Only rejects when the first byte is ASCII and neither ``-`` nor
+    whitespace, since the opening line is compared after ``strip()``.
+    """
+    if not head:
+        return False
+    first = head[0]
+    return first >= 0x80 or first == 0x2D or chr(first).isspace()
+
+
+def _scan_frontmatter(
+    lines: Iterable[str], file_path: str, max_size: Optional[int]
+) -> Optional[str]:
+    """Return the text between the opening and closing ``---`` lines.
+
+    Consumes ``lines`` only up to the closing delimiter. Returns None if the
+    first line is not ``---``, if there is no closing delimiter, or if the
+    block exceeds ``max_size`` characters.
+    """
+    it = iter(lines)
+
+    # First line must be '---'
+    first = next(it, None)
+    if first is None or first.strip() != "---":
         return None
 
-    frontmatter_text = "\n".join(lines[1:end_index])
+    # Find the closing '---'
+    block = []
+    size = 0
+    for line in it:
+        if line.strip() == "---":
+            return "\n".join(
+                chunk[:-1] if chunk.endswith("\n") else chunk for chunk in block
+            )
+        size += len(line)
+        if max_size is not None and size > max_size:
+            logger.warning(
+                "Frontmatter in %s exceeds %d characters without a closing '---'",
+                file_path,
+                max_size,
+            )
+            return None
+        block.append(line)
+
+    return None
+
+
+def _load_frontmatter_yaml(frontmatter_text: Optional[str], file_path: str) -> Optional[dict]:
+    """Parse a frontmatter block, keeping only mapping results."""
+    if frontmatter_text is None:
+        return None
 
     try:
-        parsed = yaml.safe_load(frontmatter_text)
+        parsed = safe_load(frontmatter_text)
     except yaml.YAMLError as exc:
         logger.warning("Malformed YAML frontmatter in %s: %s", file_path, exc)
         return None
 
-    # yaml.safe_load returns None for empty frontmatter, a scalar for
+    # safe_load returns None for empty frontmatter, a scalar for
     # non-mapping content — we only want dicts.
     if not isinstance(parsed, dict):
         return None
@@ -89,6 +172,41 @@ def parse_json_config(file_path: str) -> Optional[dict]:
         logger.warning("Could not parse JSON config %s: %s", file_path, exc)
         return None
 
+    return extract_json_metadata(data, file_path)
+
+
+def parse_json_config_content(content: str, file_path: str) -> Optional[dict]:
+    """Extract metadata from already-decoded JSON config content.
+
+    Same rules as ``parse_json_config``; ``file_path`` selects the
+    extraction rules by basename and is used in log messages.
+
+    Args:
+        content: Decoded JSON text.
+        file_path: Path of the file the content came from.
+
+    Returns:
+        Dict of extracted metadata fields, or None on parse failure.
+    """
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as exc:
+        logger.warning("Could not parse JSON config %s: %s", file_path, exc)
+        return None
+
+    return extract_json_metadata(data, file_path)
+
+
+def extract_json_metadata(data: object, file_path: str) -> Optional[dict]:
+    """Select the metadata fields of a parsed JSON config by file basename.
+
+    Args:
+        data: Parsed JSON value.
+        file_path: Path of the file the data came from.
+
+    Returns:
+        Dict of extracted metadata fields, or None if there are none.
+    """
     if not isinstance(data, dict):
         return None
 
@@ -154,9 +272,19 @@ def get_last_modified(file_path: str) -> str:
     Returns:
         ISO 8601 formatted UTC timestamp string.
     """
-    mtime = os.path.getmtime(file_path)
-    dt = datetime.fromtimestamp(mtime, tz=timezone.utc)
-    return dt.isoformat()
+    return format_timestamp(os.path.getmtime(file_path))
+
+
+def format_timestamp(mtime: float) -> str:
+    """Format a POSIX timestamp as an ISO 8601 UTC string.
+
+    Args:
+        mtime: Seconds since the epoch, as returned by ``os.stat``.
+
+    Returns:
+        ISO 8601 formatted UTC timestamp string.
+    """
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
 
 
 def should_upgrade_tier(frontmatter: Optional[dict]) -> bool:
@@ -0,0 +1,370 @@
+"""Rebuild pipeline for the repository index.
+
+Walks the repository, classifies tiers, extracts per-file metadata, and
+populates the ``nodes`` and ``file_manifest`` tables. Edge detection
+(Story 1.4) and glossary generation (Story 1.5) plug in after node
+population once implemented.
+
+Incremental rebuilds use ``file_manifest`` (size, mtime_ns, inode, content
+hash per path): files whose stat matches are skipped without being read,
+and files whose stat differs are re-read and compared by content hash, so
+mtime churn from git checkouts costs a read but not a node update.
+
+With ``change_source="git"``, an incremental rebuild skips the walk and
+only classifies the paths git reports as changed since the commit recorded
+in ``index_state`` (see ``scripts.lib.git_changes``), so a per-commit
+refresh costs O(changed files).
+"""
+
+import json
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from scripts.lib.file_ingest import FileRecord, ingest_files
+from scripts.lib.git_changes import GitChanges, read_changes
+from scripts.lib.index_writer import IndexWriter, UPSERT_MANIFEST_SQL, UPSERT_NODE_SQL
+from scripts.lib.metadata_cache import MetadataCache
+from scripts.lib.metadata_parser import extract_name, should_upgrade_tier
+from scripts.lib.schema import create_schema, replace_database
+from scripts.lib.token_estimator import DEFAULT_ESTIMATOR
+from scripts.lib.tier_classifier import (
+    CompiledTierRules,
+    FileInfo,
+    classify_paths,
+    derive_node_type,
+    load_tier_rules,
+    walk_repository,
+)
+
+CHANGE_SOURCES = ("walk", "git")
+
+@dataclass
+class RebuildStats:
+    """Counts and timings reported by a rebuild."""
+
+    change_source: str = "walk"  # Source actually used; "git" falls back to "walk"
+    files_walked: int = 0  # Files classified (only git's candidates in git mode)
+    files_unchanged: int = 0  # Skipped by the manifest stat check
+    files_touched: int = 0  # Stat changed but content hash did not
+    files_per_tier: dict = field(default_factory=dict)
+    nodes_added: int = 0
+    nodes_updated: int = 0
+    nodes_renamed: int = 0
+    nodes_deleted: int = 0
+    cache_hits: int = 0  # Ingested files whose metadata came from the cache
+    cache_misses: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def nodes_written(self) -> int:
+        """Node rows inserted or rewritten by this run."""
+        return self.nodes_added + self.nodes_updated + self.nodes_renamed + self.files_touched
+
+
+def rebuild_index(
+    repo_root: str,
+    db_path: str,
+    rules_path: str,
+    jobs: int = 1,
+    incremental: bool = False,
+    estimator: str = DEFAULT_ESTIMATOR,
+    cache_path: Optional[str] = None,
+    change_source: str = "walk",
+) -> RebuildStats:
+    """Rebuild the repository index.
+
+    A full rebuild builds a fresh index in memory and atomically replaces
+    the database file, so the result depends only on the current repository
+    state and readers never observe a partially written index. An
+    incremental rebuild updates the database in place in one transaction and
+    produces the same ``nodes`` content while only reading files whose
+    stat differs from ``file_manifest``. Tier rules are assumed unchanged
+    since the last run; run a full rebuild after editing tier-rules.yaml or
+    switching token estimators.
+
+    ``change_source="git"`` records HEAD and the working tree's dirty
+    paths in ``index_state`` after every rebuild; later incremental runs in
+    that mode only look at paths git reports as changed since. They fall
+    back to walking when the database has no recorded commit (e.g. the last
+    run walked) or git cannot diff against it.
+
+    Args:
+        repo_root: Absolute path to the repository root.
+        db_path: Path to the SQLite database to (re)populate.
+        rules_path: Path to tier-rules.yaml.
+        jobs: Worker processes for metadata extraction.
+        incremental: Only process files changed since the last rebuild.
+        estimator: Token estimator name used for ``token_estimate``.
+        cache_path: Metadata cache database; None disables the cache.
+        change_source: ``"walk"`` or ``"git"``; see above.
+
+    Returns:
+        RebuildStats describing the run.
+    """
+    if change_source not in CHANGE_SOURCES:
+        raise ValueError(f"Unknown change source: {change_source!r}")
+    start = time.perf_counter()
+    stats = RebuildStats()
+
+    tier_rules = CompiledTierRules(load_tier_rules(rules_path))
+
+    cache = MetadataCache(cache_path) if cache_path else None
+    try:
+        if incremental:
+            conn = create_schema(db_path)
+            try:
+                changes = None
+                if change_source == "git":
+                    changes = _git_changes_since_last_run(conn, repo_root)
+                if changes is not None:
+                    stats.change_source = "git"
+                    scope = changes.changed
+                    file_infos = list(classify_paths(repo_root, sorted(scope), tier_rules))
+                else:
+                    scope = None
+                    file_infos = list(walk_repository(repo_root, tier_rules))
+                stats.files_walked = len(file_infos)
+                with conn:
+                    _apply_incremental(conn, file_infos, jobs, stats, estimator, cache, scope)
+                    _record_git_state(conn, repo_root, change_source, changes)
+                stats.files_per_tier = _tier_counts(conn)
+            finally:
+                conn.close()
+        else:
+            file_infos = list(walk_repository(repo_root, tier_rules))
+            stats.files_walked = len(file_infos)
+            # Build in memory and swap into place, so readers never see a
+            # half-populated index and the build pays no per-transaction fsyncs.
+            conn = create_schema(":memory:")
+            try:
+                _apply_full(conn, file_infos, jobs, stats, estimator, cache)
+                _record_git_state(conn, repo_root, change_source, None)
+                stats.files_per_tier = _tier_counts(conn)
+                replace_database(conn, db_path)
+            finally:
+                conn.close()
+    finally:
+        if cache is not None:
+            stats.cache_hits = cache.hits
+            stats.cache_misses = cache.misses
+            cache.close()
+
+    stats.duration_seconds = time.perf_counter() - start
+    return stats
+
+
+def _git_changes_since_last_run(conn: sqlite3.Connection, repo_root: str) -> Optional[GitChanges]:
+    """Changes since the commit recorded by the last rebuild, or None to walk."""
+    state = dict(
+        conn.execute("SELECT key, value FROM index_state WHERE key IN ('git_commit', 'git_dirty')")
+    )
+    if "git_commit" not in state:
+        return None
+    return read_changes(repo_root, state["git_commit"], json.loads(state.get("git_dirty", "[]")))
+
+
+def _record_git_state(
+    conn: sqlite3.Connection,
+    repo_root: str,
+    change_source: str,
+    changes: Optional[GitChanges],
+) -> None:
+    """Record the commit and dirty paths this index reflects.
+
+    Only git-mode runs record state. Any other run clears it, since the
+    index may now reflect working-tree edits that the recorded dirty set
+    does not cover.
+    """
+    conn.execute("DELETE FROM index_state WHERE key IN ('git_commit', 'git_dirty')")
+    if change_source != "git":
+        return
+    if changes is None:
+        changes = read_changes(repo_root)
+        if changes is None:
+            return
+    conn.executemany(
+        "INSERT INTO index_state (key, value) VALUES (?, ?)",
+        [("git_commit", changes.commit), ("git_dirty", json.dumps(sorted(changes.dirty)))],
+    )
+
+
+def _apply_full(
+    conn: sqlite3.Connection,
+    file_infos: list,
+    jobs: int,
+    stats: RebuildStats,
+    estimator: str,
+    cache: Optional[MetadataCache],
+) -> None:
+    """Populate an empty index with freshly extracted nodes."""
+    pairs = ingest_files(file_infos, jobs=jobs, estimator=estimator, cache=cache)
+
+    with IndexWriter(conn, bulk=True) as writer:
+        for fi, rec in pairs:
+            writer.add_node(build_node_row(fi, rec))
+            writer.add_manifest(_manifest_row(fi, rec))
+    stats.nodes_added = writer.nodes_written
+
+
+def _tier_counts(conn: sqlite3.Connection) -> dict:
+    """Node count per tier, in tier order."""
+    return dict(conn.execute("SELECT tier, COUNT(*) FROM nodes GROUP BY tier ORDER BY tier"))
+
+
+def _apply_incremental(
+    conn: sqlite3.Connection,
+    file_infos: list,
+    jobs: int,
+    stats: RebuildStats,
+    estimator: str,
+    cache: Optional[MetadataCache],
+    scope: Optional[set] = None,
+) -> None:
+    """Update the index for files added, modified, renamed or deleted.
+
+    ``scope`` limits the update to those paths: ``file_infos`` must hold
+    every file in it that still exists, and manifest entries outside it are
+    left alone. None means ``file_infos`` is the whole repository.
+    """
+    query = "SELECT path, size, mtime_ns, inode, content_hash FROM file_manifest"
+    if scope is None:
+        manifest = {row[0]: row[1:] for row in conn.execute(query)}
+    else:
+        manifest = {}
+        for path in scope:
+            row = conn.execute(query + " WHERE path = ?", (path,)).fetchone()
+            if row is not None:
+                manifest[path] = row[1:]
+
+    # Stat check: files whose (size, mtime_ns, inode) match are not read.
+    to_ingest = []
+    for fi in file_infos:
+        entry = manifest.get(fi.relative_path)
+        if entry is not None:
+            try:
+                st = os.stat(fi.path)
+            except OSError:
+                st = None
+            if st is not None and (st.st_size, st.st_mtime_ns, st.st_ino) == entry[:3]:
+                stats.files_unchanged += 1
+                continue
+        to_ingest.append(fi)
+
+    pairs = ingest_files(to_ingest, jobs=jobs, estimator=estimator, cache=cache)
+
+    # Anything in the manifest that was not walked (or could no longer be
+    # read) is gone; it may reappear under a new path with the same hash.
+    present = {fi.relative_path for fi in file_infos}
+    present -= {fi.relative_path for fi in to_ingest} - {fi.relative_path for fi, _ in pairs}
+    gone_by_hash = defaultdict(list)
+    for path in sorted(set(manifest) - present):
+        gone_by_hash[manifest[path][3]].append(path)
+
+    changed_sources = []
+    for fi, rec in pairs:
+        rel = fi.relative_path
+        entry = manifest.get(rel)
+        conn.execute(UPSERT_NODE_SQL, build_node_row(fi, rec))
+        conn.execute(UPSERT_MANIFEST_SQL, _manifest_row(fi, rec))
+        if entry is not None:
+            if entry[3] == rec.content_hash:
+                stats.files_touched += 1
+            else:
+                stats.nodes_updated += 1
+                changed_sources.append(rel)
+        elif gone_by_hash.get(rec.content_hash):
+            old_path = gone_by_hash[rec.content_hash].pop(0)
+            _move_node_references(conn, old_path, rel)
+            _delete_nodes(conn, [old_path])
+            stats.nodes_renamed += 1
+        else:
+            stats.nodes_added += 1
+            changed_sources.append(rel)
+
+    deleted = sorted(path for paths in gone_by_hash.values() for path in paths)
+    _delete_nodes(conn, deleted)
+    stats.nodes_deleted = len(deleted)
+
+    _invalidate_outgoing_edges(conn, changed_sources)
+
+
+def _invalidate_outgoing_edges(conn: sqlite3.Connection, source_ids: list) -> None:
+    """Drop edges derived from files whose content changed.
+
+    Edges where a changed file is the target stay valid (the target still
+    exists). Edge detection re-derives the outgoing edges of ``source_ids``.
+    """
+    conn.executemany("DELETE FROM edges WHERE source_id = ?", [(s,) for s in source_ids])
+
+
+def _move_node_references(conn: sqlite3.Connection, old_id: str, new_id: str) -> None:
+    """Point edges and glossary entries for a renamed file at its new node."""
+    conn.execute("UPDATE edges SET source_id = ? WHERE source_id = ?", (new_id, old_id))
+    conn.execute("UPDATE edges SET target_id = ? WHERE target_id = ?", (new_id, old_id))
+    conn.execute(
+        "UPDATE glossary_canonical SET source_file = ? WHERE source_file = ?",
+        (new_id, old_id),
+    )
+
+
+def _delete_nodes(conn: sqlite3.Connection, node_ids: list) -> None:
+    """Delete nodes and every row that references them."""
+    for node_id in node_ids:
+        terms = [
+            (row[0],)
+            for row in conn.execute(
+                "SELECT term FROM glossary_canonical WHERE source_file = ?", (node_id,)
+            )
+        ]
+        conn.executemany("DELETE FROM glossary_variants WHERE canonical_term = ?", terms)
+        conn.executemany("DELETE FROM glossary_forbidden WHERE canonical_term = ?", terms)
+        conn.execute("DELETE FROM glossary_canonical WHERE source_file = ?", (node_id,))
+        conn.execute(
+            "DELETE FROM edges WHERE source_id = ? OR target_id = ?", (node_id, node_id)
+        )
+        conn.execute("DELETE FROM file_manifest WHERE path = ?", (node_id,))
+        conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+
+
+def _manifest_row(file_info: FileInfo, record: FileRecord) -> tuple:
+    """Build a ``file_manifest`` row for a file."""
+    return (
+        file_info.relative_path,
+        record.size,
+        record.mtime_ns,
+        record.inode,
+        record.content_hash,
+    )
+
+
+def build_node_row(file_info: FileInfo, record: FileRecord) -> tuple:
+    """Build a ``nodes`` table row for a file.
+
+    Applies the frontmatter-based Tier 1 upgrade and re-derives the node
+    type for the final tier.
+
+    Returns:
+        Tuple of (id, tier, type, name, token_estimate, frontmatter,
+        last_modified) in column order.
+    """
+    frontmatter = record.frontmatter
+    tier = file_info.tier
+    node_type = file_info.node_type
+    if tier > 1 and should_upgrade_tier(frontmatter):
+        tier = 1
+        node_type = derive_node_type(file_info.relative_path, tier)
+
+    return (
+        file_info.relative_path,
+        tier,
+        node_type,
+        extract_name(file_info.relative_path, frontmatter),
+        record.token_estimate,
+        # YAML dates and timestamps are not JSON types; store them as strings.
+        json.dumps(frontmatter, default=str) if frontmatter is not None else None,
+        record.last_modified,
+    )
@@ -1,13 +1,109 @@
 """SQLite schema creation for the documentation generation repository index."""
 
+import os
 import sqlite3
+import tempfile
+
+
+# Ordered (version, DDL) migrations. A database at version N has had every
+# migration up to N applied; create_schema() applies the rest in order, so
+# existing repo-index.db files upgrade in place. Append new migrations; never
+# edit one that has shipped.
+_MIGRATIONS = [
+    (
+        1,
+        """
+    CREATE TABLE IF NOT EXISTS nodes (
+        id              TEXT PRIMARY KEY,
+        tier            INTEGER NOT NULL,
+        type            TEXT NOT NULL,
+        name            TEXT,
+        token_estimate  INTEGER,
+        frontmatter     TEXT,             -- raw YAML stored as JSON string; no DB-level validation, use json.dumps() when inserting
+        last_modified   TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS edges (
+        source_id   TEXT NOT NULL,
+        target_id   TEXT NOT NULL,
+        edge_type   TEXT NOT NULL,
+        UNIQUE (source_id, target_id, edge_type),
+        FOREIGN KEY (source_id) REFERENCES nodes(id),
+        FOREIGN KEY (target_id) REFERENCES nodes(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS glossary_canonical (
+        term        TEXT PRIMARY KEY,
+        definition  TEXT NOT NULL,
+        source_file TEXT NOT NULL,
+        FOREIGN KEY (source_file) REFERENCES nodes(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS glossary_variants (
+        variant         TEXT PRIMARY KEY,
+        canonical_term  TEXT NOT NULL,
+        usage_rule      TEXT,
+        FOREIGN KEY (canonical_term) REFERENCES glossary_canonical(term)
+    );
+
+    CREATE TABLE IF NOT EXISTS glossary_forbidden (
+        forbidden_term  TEXT PRIMARY KEY,
+        canonical_term  TEXT NOT NULL,
+        FOREIGN KEY (canonical_term) REFERENCES glossary_canonical(term)
+    );
+
+    -- Per-file stat snapshot and content hash from the last rebuild;
+    -- incremental rebuilds compare against it to find changed files.
+    CREATE TABLE IF NOT EXISTS file_manifest (
+        path            TEXT PRIMARY KEY,
+        size            INTEGER NOT NULL,
+        mtime_ns        INTEGER NOT NULL,
+        inode           INTEGER NOT NULL,
+        content_hash    TEXT NOT NULL,
+        FOREIGN KEY (path) REFERENCES nodes(id)
+    );
+    """,
+    ),
+    (
+        2,
+        """
+    -- Reverse traversal: who points at this file (optionally by edge type)?
+    -- Includes source_id so the lookup is answered from the index alone.
+    CREATE INDEX IF NOT EXISTS idx_edges_target_type
+        ON edges (target_id, edge_type, source_id);
+
+    -- Per-edge-type scans and depth-capped expansion by type.
+    CREATE INDEX IF NOT EXISTS idx_edges_type_source
+        ON edges (edge_type, source_id, target_id);
+
+    CREATE INDEX IF NOT EXISTS idx_nodes_tier_type
+        ON nodes (tier, type);
+    """,
+    ),
+    (
+        3,
+        """
+    -- Key/value state carried between rebuilds, e.g. the git commit the
+    -- index was built from for git-based change detection.
+    CREATE TABLE IF NOT EXISTS index_state (
+        key     TEXT PRIMARY KEY,
+        value   TEXT NOT NULL
+    );
+    """,
+    ),
+]
+
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
 
 
 def create_schema(db_path: str) -> sqlite3.Connection:
-    """Create the repository index schema in a SQLite database.
+    """Create or upgrade the repository index schema in a SQLite database.
 
     Creates tables: nodes, edges, glossary_canonical, glossary_variants,
-    glossary_forbidden. Uses IF NOT EXISTS for idempotency.
+    glossary_forbidden, file_manifest, index_state, schema_version, plus the traversal
+    indexes. Pending migrations are applied in order, each in its own
+    transaction, so databases created by older versions upgrade in place.
+    Safe to call repeatedly.
 
     Args:
         db_path: Path to the SQLite database file, or ":memory:" for in-memory.
@@ -19,47 +115,74 @@ def create_schema(db_path: str) -> sqlite3.Connection:
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
 
-    conn.executescript(
-        """
-        CREATE TABLE IF NOT EXISTS nodes (
-            id              TEXT PRIMARY KEY,
-            tier            INTEGER NOT NULL,
-            type            TEXT NOT NULL,
-            name            TEXT,
-            token_estimate  INTEGER,
-            frontmatter     TEXT,             -- raw YAML stored as JSON string; no DB-level validation, use json.dumps() when inserting
-            last_modified   TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS edges (
-            source_id   TEXT NOT NULL,
-            target_id   TEXT NOT NULL,
-            edge_type   TEXT NOT NULL,
-            UNIQUE (source_id, target_id, edge_type),
-            FOREIGN KEY (source_id) REFERENCES nodes(id),
-            FOREIGN KEY (target_id) REFERENCES nodes(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS glossary_canonical (
-            term        TEXT PRIMARY KEY,
-            definition  TEXT NOT NULL,
-            source_file TEXT NOT NULL,
-            FOREIGN KEY (source_file) REFERENCES nodes(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS glossary_variants (
-            variant         TEXT PRIMARY KEY,
-            canonical_term  TEXT NOT NULL,
-            usage_rule      TEXT,
-            FOREIGN KEY (canonical_term) REFERENCES glossary_canonical(term)
-        );
-
-        CREATE TABLE IF NOT EXISTS glossary_forbidden (
-            forbidden_term  TEXT PRIMARY KEY,
-            canonical_term  TEXT NOT NULL,
-            FOREIGN KEY (canonical_term) REFERENCES glossary_canonical(term)
-        );
-        """
-    )
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    current = get_schema_version(conn)
+    for version, ddl in _MIGRATIONS:
+        if version > current:
+            conn.executescript(
+                f"BEGIN;\n{ddl}\n"
+                f"DELETE FROM schema_version;\n"
+                f"INSERT INTO schema_version (version) VALUES ({version});\n"
+                f"COMMIT;"
+            )
 
     return conn
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in the database (0 if none)."""
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def replace_database(
+    source: sqlite3.Connection, db_path: str, timeout: float = 5.0
+) -> None:
+    """Atomically replace the database at ``db_path`` with a copy of ``source``.
+
+    The copy is written to a temporary file next to ``db_path`` with the
+    SQLite backup API and then renamed over it, so readers see either the
+    old database or the new one, never a partially written one.
+
+    An existing database is first switched out of WAL mode, which
+    checkpoints and removes its ``-wal``/``-shm`` files; otherwise they would
+    be applied to the new file after the rename. That switch needs the
+    database to be otherwise unused, so this waits up to ``timeout`` seconds
+    for other connections to close.
+
+    Args:
+        source: Open connection to the database to persist (e.g. ":memory:").
+        db_path: Path of the live database file.
+        timeout: Seconds to wait for other connections to the live database.
+
+    Raises:
+        sqlite3.OperationalError: If the live database stays in use; it is
+            left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(db_path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(db_path) + ".", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        dest = sqlite3.connect(tmp_path)
+        try:
+            source.backup(dest)
+        finally:
+            dest.close()
+
+        if os.path.exists(db_path):
+            live = sqlite3.connect(db_path, timeout=timeout)
+            try:
+                mode = live.execute("PRAGMA journal_mode = DELETE").fetchone()[0]
+            finally:
+                live.close()
+            if mode != "delete":
+                raise sqlite3.OperationalError(
+                    f"could not take {db_path} out of {mode} mode; is it in use?"
+                )
+
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
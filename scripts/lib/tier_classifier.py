@@ -5,11 +5,14 @@ configurable glob rules in tier-rules.yaml, and derives a node type.
 """
 
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from fnmatch import fnmatch
-from typing import Iterator
+from fnmatch import translate
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Union
 
-import yaml
+from scripts.lib.yaml_loader import safe_load
 
 
 @dataclass
@@ -32,57 +35,90 @@ def load_tier_rules(rules_path: str) -> dict:
         Dict with keys tier_1, tier_2, tier_3, tier_4.
     """
     with open(rules_path, "r") as f:
-        return yaml.safe_load(f)
+        return safe_load(f)
 
 
-def classify_tier(relative_path: str, tier_rules: dict) -> int:
-    """Classify a file into a tier based on its relative path.
-
-    Evaluation order: Tier 4 (exclusion) -> Tier 1 -> Tier 2 -> Tier 3 (default).
+class CompiledTierRules:
+    """Tier rules pre-compiled for fast repeated classification.
 
-    Args:
-        relative_path: File path relative to repo root, using forward slashes.
-        tier_rules: Loaded tier rules dict from load_tier_rules().
+    Each of the ``tier_1`` and ``tier_2`` pattern lists is translated into a
+    single combined regex, and the Tier 4 lists are turned into sets, so
+    classifying a path costs a few set lookups plus at most two regex
+    matches instead of one ``fnmatch`` loop per pattern. Semantics are
+    identical to evaluating each pattern with ``_match_glob`` in order.
 
-    Returns:
-        Integer tier: 1, 2, 3, or 4.
+    Build once per rules dict (e.g. right after ``load_tier_rules()``) and
+    reuse for every file.
     """
-    # Normalize path separators to forward slashes
-    rel = relative_path.replace(os.sep, "/")
 
-    # --- Tier 4: Exclusion check ---
-    tier_4 = tier_rules.get("tier_4", {})
-
-    # Check excluded directories
-    parts = rel.split("/")
-    for directory in tier_4.get("directories", []):
-        if directory in parts:
+    def __init__(self, tier_rules: dict):
+        tier_4 = tier_rules.get("tier_4", {})
+        self.excluded_dirs = frozenset(tier_4.get("directories", []))
+        self.excluded_extensions = frozenset(tier_4.get("extensions", []))
+        self.excluded_files = frozenset(tier_4.get("files", []))
+        self._tier_1 = _compile_pattern_set(tier_rules.get("tier_1", []))
+        self._tier_2 = _compile_pattern_set(tier_rules.get("tier_2", []))
+
+    def classify(self, relative_path: str) -> int:
+        """Classify a file into a tier based on its relative path.
+
+        Args:
+            relative_path: File path relative to repo root.
+
+        Returns:
+            Integer tier: 1, 2, 3, or 4.
+        """
+        rel = relative_path.replace(os.sep, "/")
+
+        # --- Tier 4: Exclusion check ---
+        # Every path component (including the filename) is checked against
+        # the excluded directory names.
+        if not self.excluded_dirs.isdisjoint(rel.split("/")):
             return 4
 
-    # Check excluded file extensions
-    _, ext = os.path.splitext(rel)
-    if ext in tier_4.get("extensions", []):
-        return 4
+        _, ext = os.path.splitext(rel)
+        if ext in self.excluded_extensions:
+            return 4
 
-    # Check excluded specific files
-    filename = os.path.basename(rel)
-    if filename in tier_4.get("files", []) or rel in tier_4.get("files", []):
-        return 4
+        filename = rel.rsplit("/", 1)[-1]
+        if filename in self.excluded_files or rel in self.excluded_files:
+            return 4
 
-    # --- Tier 1: Definitional files ---
-    for pattern in tier_rules.get("tier_1", []):
-        if _match_glob(rel, pattern):
+        # --- Tier 1: Definitional files ---
+        if self._tier_1 is not None and self._tier_1.match(rel):
             return 1
 
-    # --- Tier 2: Structural files ---
-    for pattern in tier_rules.get("tier_2", []):
-        if _match_glob(rel, pattern):
+        # --- Tier 2: Structural files ---
+        if self._tier_2 is not None and self._tier_2.match(rel):
             return 2
 
-    # --- Default: Tier 3 ---
-    # tier_3 patterns in tier-rules.yaml exist as documentation only;
-    # anything not matched by Tier 4/1/2 defaults to Tier 3.
-    return 3
+        # --- Default: Tier 3 ---
+        # tier_3 patterns in tier-rules.yaml exist as documentation only;
+        # anything not matched by Tier 4/1/2 defaults to Tier 3.
+        return 3
+
+
+def classify_tier(
+    relative_path: str, tier_rules: Union[dict, CompiledTierRules]
+) -> int:
+    """Classify a file into a tier based on its relative path.
+
+    Evaluation order: Tier 4 (exclusion) -> Tier 1 -> Tier 2 -> Tier 3 (default).
+
+    Passing a raw rules dict compiles it on every call; callers classifying
+    many paths should build a ``CompiledTierRules`` once and pass that.
+
+    Args:
+        relative_path: File path relative to repo root, using forward slashes.
+        tier_rules: Loaded tier rules dict from load_tier_rules(), or a
+            CompiledTierRules built from it.
+
+    Returns:
+        Integer tier: 1, 2, 3, or 4.
+    """
+    if not isinstance(tier_rules, CompiledTierRules):
+        tier_rules = CompiledTierRules(tier_rules)
+    return tier_rules.classify(relative_path)
 
 
 def derive_node_type(relative_path: str, tier: int) -> str:
@@ -99,18 +135,9 @@ def derive_node_type(relative_path: str, tier: int) -> str:
     rel = relative_path.replace(os.sep, "/")
 
     # Path-based type derivation (order matters for specificity)
-    if _match_glob(rel, "docs/stories/*"):
-        return "story"
-    if _match_glob(rel, "docs/epics/*"):
-        return "epic"
-    if _match_glob(rel, ".claude/hooks/*"):
-        return "hook"
-    if _match_glob(rel, ".claude/skills/**/*") or _match_glob(rel, ".claude/skills/*"):
-        return "skill"
-    if _match_glob(rel, ".claude/agents/*"):
-        return "agent"
-    if _match_glob(rel, "docs/adr/*"):
-        return "adr"
+    match = _PATH_NODE_TYPES.match(rel)
+    if match:
+        return match.lastgroup
 
     # Type definition files
     if rel.endswith(".d.ts"):
@@ -130,50 +157,173 @@ def derive_node_type(relative_path: str, tier: int) -> str:
 
 
 def walk_repository(
-    root: str, tier_rules: dict
+    root: str, tier_rules: Union[dict, CompiledTierRules], workers: int = 1
 ) -> Iterator[FileInfo]:
     """Walk a repository, classify files, and yield FileInfo for non-excluded files.
 
-    Tier 4 directories are pruned in-place so os.walk() never descends into them.
-    Tier 4 files are skipped entirely.
+    Tier 4 directories are pruned before descent, so the walker never enters
+    them. Tier 4 files are skipped entirely.
+
+    Output order is deterministic regardless of ``workers``: directories are
+    visited depth-first in sorted order, and within each directory its files
+    (sorted by name) are yielded before its subdirectories.
+
+    With ``workers > 1``, directories are listed with ``os.scandir`` on a
+    thread pool: each scanned directory immediately queues its
+    subdirectories, so listing runs ahead of the consumer. This mainly pays
+    off on network mounts and cold caches, where ``scandir`` blocks on I/O.
 
     Args:
         root: Absolute path to the repository root.
-        tier_rules: Loaded tier rules dict.
+        tier_rules: Loaded tier rules dict, or a CompiledTierRules.
+        workers: Number of scanning threads. 1 walks serially with os.walk().
 
     Yields:
         FileInfo for each non-excluded file.
     """
-    tier_4 = tier_rules.get("tier_4", {})
-    excluded_dirs = set(tier_4.get("directories", []))
+    if not isinstance(tier_rules, CompiledTierRules):
+        tier_rules = CompiledTierRules(tier_rules)
+
+    if workers > 1:
+        yield from _walk_parallel(root, tier_rules, workers)
+        return
+
+    excluded_dirs = tier_rules.excluded_dirs
 
     for dirpath, dirnames, filenames in os.walk(root):
         # Prune excluded directories in-place (prevents descent)
-        dirnames[:] = [
+        dirnames[:] = sorted(
             d for d in dirnames
             if d not in excluded_dirs
-        ]
+        )
+
+        # Relative directory prefix, computed once per directory
+        # (normalized to forward slashes)
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
 
-        for filename in filenames:
+        for filename in sorted(filenames):
             abs_path = os.path.join(dirpath, filename)
-            rel_path = os.path.relpath(abs_path, root)
-            # Normalize to forward slashes
-            rel_path = rel_path.replace(os.sep, "/")
+            rel_path = prefix + filename
 
-            tier = classify_tier(rel_path, tier_rules)
+            file_info = _classify_file(abs_path, rel_path, tier_rules)
+            if file_info is not None:
+                yield file_info
 
-            # Skip Tier 4 files
-            if tier == 4:
-                continue
 
-            node_type = derive_node_type(rel_path, tier)
+def classify_paths(
+    root: str, relative_paths: Iterable[str], tier_rules: Union[dict, CompiledTierRules]
+) -> Iterator[FileInfo]:
+    """Classify a known set of paths without walking the tree.
 
-            yield FileInfo(
-                path=abs_path,
-                relative_path=rel_path,
-                tier=tier,
-                node_type=node_type,
-            )
+    Yields the FileInfo ``walk_repository`` would yield for each path:
+    paths that are not regular files, are Tier 4, or lie inside an excluded
+    directory are skipped. Output follows the order of ``relative_paths``.
+
+    Args:
+        root: Absolute path to the repository root.
+        relative_paths: Paths relative to ``root``, using forward slashes.
+        tier_rules: Loaded tier rules dict, or a CompiledTierRules.
+
+    Yields:
+        FileInfo for each existing, non-excluded file.
+    """
+    if not isinstance(tier_rules, CompiledTierRules):
+        tier_rules = CompiledTierRules(tier_rules)
+
+    for rel_path in relative_paths:
+        abs_path = os.path.join(root, *rel_path.split("/"))
+        if not os.path.isfile(abs_path):
+            continue
+        file_info = _classify_file(abs_path, rel_path, tier_rules)
+        if file_info is not None:
+            yield file_info
+
+
+def _walk_parallel(
+    root: str, tier_rules: CompiledTierRules, workers: int
+) -> Iterator[FileInfo]:
+    """Parallel implementation of walk_repository() (see its docstring)."""
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Futures are popped depth-first; children are pushed in reverse so
+        # the lexicographically first subdirectory is consumed next.
+        stack = [pool.submit(_scan_directory, pool, root, "", tier_rules)]
+        while stack:
+            files, children = stack.pop().result()
+            yield from files
+            stack.extend(reversed(children))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _scan_directory(
+    pool: ThreadPoolExecutor,
+    abs_dir: str,
+    rel_dir: str,
+    tier_rules: CompiledTierRules,
+) -> tuple:
+    """List one directory, classify its files, and queue its subdirectories.
+
+    Mirrors os.walk() semantics: entries whose ``is_dir()`` is true (following
+    symlinks) count as directories, but symlinked directories are not
+    descended into. Unreadable directories are skipped silently.
+
+    Returns:
+        Tuple of (sorted list of FileInfo, list of futures for subdirectories
+        in sorted order).
+    """
+    try:
+        with os.scandir(abs_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return [], []
+
+    files = []
+    subdirs = []
+    for entry in entries:
+        try:
+            # DirEntry.is_dir() uses the d_type from the directory listing,
+            # avoiding a stat() call per entry on most filesystems.
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        if is_dir:
+            if entry.name not in tier_rules.excluded_dirs and not entry.is_symlink():
+                subdirs.append((entry.path, rel_path))
+            continue
+        file_info = _classify_file(entry.path, rel_path, tier_rules)
+        if file_info is not None:
+            files.append(file_info)
+
+    try:
+        children = [
+            pool.submit(_scan_directory, pool, path, rel, tier_rules)
+            for path, rel in subdirs
+        ]
+    except RuntimeError:
+        # Pool shut down because the consumer stopped iterating.
+        children = []
+    return files, children
+
+
+def _classify_file(
+    abs_path: str, rel_path: str, tier_rules: CompiledTierRules
+) -> Optional[FileInfo]:
+    """Build a FileInfo for a file, or return None if it is Tier 4."""
+    tier = tier_rules.classify(rel_path)
+
+    # Skip Tier 4 files
+    if tier == 4:
+        return None
+
+    return FileInfo(
+        path=abs_path,
+        relative_path=rel_path,
+        tier=tier,
+        node_type=derive_node_type(rel_path, tier),
+    )
 
 
 def _match_glob(path: str, pattern: str) -> bool:
@@ -193,43 +343,71 @@ def _match_glob(path: str, pattern: str) -> bool:
     Returns:
         True if the path matches the pattern.
     """
-    # --- Handle **/suffix patterns first (match at any depth) ---
+    return _compile_glob(pattern).match(path) is not None
+
+
+@lru_cache(maxsize=None)
+def _compile_glob(pattern: str) -> "re.Pattern[str]":
+    """Compile a single glob pattern into an anchored regex."""
+    return re.compile(_glob_to_regex(pattern))
+
+
+def _compile_pattern_set(patterns: list) -> Optional["re.Pattern[str]"]:
+    """Compile a list of glob patterns into one alternation regex.
+
+    Returns None for an empty list so callers can skip the match entirely.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{_glob_to_regex(p)})" for p in patterns))
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a tier-rules glob into a regex with ``_match_glob`` semantics.
+
+    The result is meant for ``re.match`` (anchored at the start); every
+    branch ends in ``\\Z`` via ``fnmatch.translate``. ``(?:.*/)?`` selects
+    a tail starting at any segment boundary, equivalent to trying
+    ``fnmatch`` against each tail in turn.
+    """
+    # --- **/suffix: suffix matches any segment-aligned tail ---
     if pattern.startswith("**/"):
-        suffix = pattern[3:]
-        # Try matching suffix against each possible tail of the path
-        # e.g. for path "a/b/c.md" try "a/b/c.md", "b/c.md", "c.md"
-        segments = path.split("/")
-        for i in range(len(segments)):
-            tail = "/".join(segments[i:])
-            if fnmatch(tail, suffix):
-                return True
-        return False
-
-    # --- Handle prefix/**/suffix patterns ---
+        return "(?s:(?:.*/)?)" + translate(pattern[3:])
+
+    # --- prefix/**/suffix ---
     if "**" in pattern:
         parts = pattern.split("**")
         if len(parts) == 2:
             prefix = parts[0].rstrip("/")
             suffix = parts[1].lstrip("/")
 
-            # Prefix must match the start of the path
-            if prefix and not path.startswith(prefix):
-                return False
-
+            # The prefix is a literal string-prefix check, not a glob.
             if not suffix:
-                # Pattern ends with ** — match anything under prefix
-                return path.startswith(prefix) if prefix else True
-
-            # Strip the prefix from the path and match suffix against the tail
-            remaining = path[len(prefix):].lstrip("/") if prefix else path
-            # Try matching suffix against each possible tail of remaining
-            segments = remaining.split("/")
-            for i in range(len(segments)):
-                tail = "/".join(segments[i:])
-                if fnmatch(tail, suffix):
-                    return True
-            return False
+                return "(?s:" + re.escape(prefix) + ".*)"
+
+            if not prefix:
+                return "(?s:(?:.*/)?)" + translate(suffix)
+
+            # Leading slashes after the prefix are stripped before the tails
+            # are tried, hence "/*(?!/)" consumes all of them.
+            return "(?s:" + re.escape(prefix) + "/*(?!/)(?:.*/)?)" + translate(suffix)
 
     # --- Simple patterns: match full path or basename ---
     # Basename fallback is intentional so patterns like "jest.config.*" match at any depth.
-    return fnmatch(path, pattern) or fnmatch(os.path.basename(path), pattern)
+    simple = translate(pattern)
+    return f"{simple}|(?s:.*/)(?=[^/]*\\Z){simple}"
+
+
+# Path-based node types, in priority order. Combined into one regex whose
+# alternation order preserves that priority; the matching group names the type.
+_PATH_NODE_TYPES = re.compile("|".join(
+    f"(?P<{node_type}>" + "|".join(f"(?:{_glob_to_regex(p)})" for p in patterns) + ")"
+    for node_type, patterns in (
+        ("story", ("docs/stories/*",)),
+        ("epic", ("docs/epics/*",)),
+        ("hook", (".claude/hooks/*",)),
+        ("skill", (".claude/skills/**/*", ".claude/skills/*")),
+        ("agent", (".claude/agents/*",)),
+        ("adr", ("docs/adr/*",)),
+    )
+))
@@ -1,27 +1,335 @@
 """Token estimation for repository files.
 
-Uses a word-count heuristic (word_count * 1.3) to estimate token cost.
+Estimators are pluggable and selected by name:
+
+- ``words``: word count * 1.3. Cheap, but undercounts punctuation-dense
+  code and JSON badly. Files are counted straight from an mmap in
+  fixed-size chunks without decoding them whole.
+- ``heuristic`` (default): character-class counts (alphanumeric runs,
+  punctuation runs, extra whitespace) weighted by coefficients fitted per
+  content kind (prose, code, JSON) against the BPE backend on this
+  repository's ``.md``, ``.ts`` and ``.json`` files.
+- ``bpe``: exact byte-level BPE token count using the vendored GPT-2
+  merges file in ``scripts/lib/vocab/``. Pure Python, so results are
+  cached by content hash.
 """
 
+import hashlib
 import logging
+import mmap
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ESTIMATOR = "heuristic"
+
+VOCAB_PATH = os.path.join(os.path.dirname(__file__), "vocab", "gpt2-vocab.bpe")
+
+PROSE_EXTENSIONS = frozenset({".md", ".mdx", ".txt", ".rst"})
+JSON_EXTENSIONS = frozenset({".json", ".jsonc"})
+
+
+def content_kind(file_path: str) -> str:
+    """Classify a file as ``prose``, ``json`` or ``code`` by extension."""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in PROSE_EXTENSIONS:
+        return "prose"
+    if ext in JSON_EXTENSIONS:
+        return "json"
+    return "code"
+
+
+class WordCountEstimator:
+    """``round(word_count * 1.3)``."""
+
+    name = "words"
+
+    def count(self, content: str, kind: str = "prose") -> int:
+        return round(len(content.split()) * 1.3)
+
+    def count_file(self, file_path: str, kind: str = "prose") -> int:
+        words = count_words_in_file(file_path)
+        return 0 if words is None else round(words * 1.3)
+
+
+WORD_COUNT_CHUNK_SIZE = 1 << 18
+
+# Whitespace per str.isspace() that is not ASCII whitespace per bytes.split():
+# U+001C..U+001F, plus the multi-byte UTF-8 sequences of U+0085, U+00A0,
+# U+1680, U+2000..U+200A, U+2028, U+2029, U+202F, U+205F and U+3000.
+_UNICODE_SPACE_RE = re.compile(
+    rb"\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80"
+)
+# Prefixes of those sequences; the regex pass is skipped if none occur.
+_UNICODE_SPACE_PREFIXES = (b"\xc2", b"\xe1\x9a\x80", b"\xe2\x80", b"\xe2\x81\x9f", b"\xe3\x80\x80")
+
+
+def _space_table() -> bytes:
+    """Byte -> ``b" "`` for str whitespace in the ASCII range, ``b"w"`` otherwise."""
+    table = bytearray(b"w" * 256)
+    for b in range(0x80):
+        if chr(b).isspace():
+            table[b] = ord(" ")
+    return bytes(table)
+
+
+_SPACE_TABLE = _space_table()
+
+
+def count_words(data: bytes) -> int:
+    """Count whitespace-delimited words in UTF-8 bytes.
+
+    Equals ``len(data.decode("utf-8").split())`` for valid UTF-8 without
+    building the string or the word list.
+    """
+    return _scan_words(data, True)[0]
+
+
+def _scan_words(data: bytes, previous_space: bool) -> tuple:
+    """Return (words starting in ``data``, whether ``data`` ends in whitespace).
+
+    ``previous_space`` says whether the byte before ``data`` was whitespace,
+    for counting across chunks cut at character boundaries.
+    """
+    if not data:
+        return 0, previous_space
+    if not data.isascii() and any(prefix in data for prefix in _UNICODE_SPACE_PREFIXES):
+        data = _UNICODE_SPACE_RE.sub(b" ", data)
+    classes = data.translate(_SPACE_TABLE)
+    words = classes.count(b" w") + (previous_space and classes[:1] == b"w")
+    return words, classes[-1:] == b" "
+
+
+def count_words_in_file(file_path: str, chunk_size: int = WORD_COUNT_CHUNK_SIZE) -> Optional[int]:
+    """Count whitespace-delimited words in a UTF-8 file via mmap.
+
+    The file is scanned in ``chunk_size`` pieces, cut at UTF-8 character
+    boundaries, so memory use stays bounded regardless of file size.
+
+    Args:
+        file_path: Path to the file.
+        chunk_size: Bytes scanned per step.
+
+    Returns:
+        Same count as ``len(open(file_path, encoding="utf-8").read().split())``,
+        or None if the file is unreadable or not valid UTF-8.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                words = 0
+                previous_space = True
+                start = 0
+                while start < size:
+                    end = min(start + chunk_size, size)
+                    # Cut before a character start (never on a continuation
+                    # byte), extending past one character if the chunk is tiny.
+                    while end > start and end < size and 0x80 <= mm[end] < 0xC0:
+                        end -= 1
+                    if end == start:
+                        end += 1
+                        while end < size and 0x80 <= mm[end] < 0xC0:
+                            end += 1
+                    chunk = mm[start:end]
+                    chunk.decode("utf-8")  # strict validation, as text-mode open() does
+                    chunk_words, previous_space = _scan_words(chunk, previous_space)
+                    words += chunk_words
+                    start = end
+                return words
+    except (OSError, ValueError):
+        # Unreadable, not mmappable, or not valid UTF-8 (UnicodeDecodeError)
+        return None
+
+
+def _class_table() -> bytes:
+    """Byte -> class map: ``w`` alphanumeric or non-ASCII, `` `` whitespace, ``p`` other."""
+    table = bytearray(b"p" * 256)
+    for b in range(256):
+        if b >= 0x80 or chr(b).isalnum():
+            table[b] = ord("w")
+    for b in b" \t\n\r\x0b\x0c":
+        table[b] = ord(" ")
+    return bytes(table)
+
+
+_CLASS_TABLE = _class_table()
 
-def estimate_tokens(file_path: str) -> int:
-    """Estimate the token count for a file using word count heuristic.
+# (per word run, per punctuation run, per extra whitespace byte), fitted by
+# relative-error least squares against BpeEstimator on this repository
+# (mean absolute error 5% prose, 4% code, 10% JSON, vs 41%/64%/77% for
+# ``words``). The JSON fit drops punctuation, which came out negative
+# on the small sample.
+HEURISTIC_COEFFICIENTS = {
+    "prose": (1.07, 1.55, 0.99),
+    "code": (1.48, 1.05, 1.04),
+    "json": (3.67, 0.0, 1.16),
+}
 
-    Reads the file, splits on whitespace, and multiplies the word count
-    by 1.3 (rounded to the nearest integer).
+
+class HeuristicEstimator:
+    """Character-class heuristic with per-kind coefficients.
+
+    Counts alphanumeric runs, punctuation runs (underscore included, as the
+    BPE pre-tokenizer splits identifiers on it) and whitespace beyond the
+    first byte of each run (indentation, which BPE encodes poorly). The
+    UTF-8 bytes are mapped to one class letter each with
+    ``bytes.translate`` and runs are counted as class transitions, so the
+    whole estimate is a handful of C-level passes.
+    """
+
+    name = "heuristic"
+
+    def __init__(self, coefficients: dict = None):
+        self.coefficients = coefficients or HEURISTIC_COEFFICIENTS
+
+    def count(self, content: str, kind: str = "prose") -> int:
+        per_word, per_punct, per_space = self.coefficients[kind]
+        classes = content.encode("utf-8", "surrogatepass").translate(_CLASS_TABLE)
+        words = classes.count(b"pw") + classes.count(b" w") + classes.startswith(b"w")
+        punct = classes.count(b"wp") + classes.count(b" p") + classes.startswith(b"p")
+        space_runs = classes.count(b"w ") + classes.count(b"p ") + classes.startswith(b" ")
+        spaces = classes.count(b" ") - space_runs
+        return round(words * per_word + punct * per_punct + spaces * per_space)
+
+
+# GPT-2 pre-tokenizer pattern with \p{L} / \p{N} expressed in stdlib re.
+_PRETOKENIZE_RE = re.compile(
+    r"""'s|'t|'re|'ve|'m|'ll|'d| ?[^\W\d_]+| ?\d+| ?(?:[^\s\w]|_)+|\s+(?!\S)|\s+"""
+)
+
+
+def _byte_alphabet() -> dict:
+    """GPT-2's reversible byte -> printable character mapping."""
+    printable = (
+        list(range(ord("!"), ord("~") + 1))
+        + list(range(ord("¡"), ord("¬") + 1))
+        + list(range(ord("®"), ord("ÿ") + 1))
+    )
+    chars = printable[:]
+    extra = 0
+    for b in range(256):
+        if b not in printable:
+            printable.append(b)
+            chars.append(256 + extra)
+            extra += 1
+    return {b: chr(c) for b, c in zip(printable, chars)}
+
+
+class BpeEstimator:
+    """Exact token count under a byte-level BPE merges file."""
+
+    name = "bpe"
+
+    def __init__(self, vocab_path: str = VOCAB_PATH):
+        with open(vocab_path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        merges = [tuple(line.split()) for line in lines[1:] if line]
+        self.ranks = {pair: rank for rank, pair in enumerate(merges)}
+        self._alphabet = _byte_alphabet()
+        self._piece_count = lru_cache(maxsize=65536)(self._bpe_length)
+
+    def _bpe_length(self, piece: str) -> int:
+        symbols = [self._alphabet[b] for b in piece.encode("utf-8")]
+        ranks = self.ranks
+        while len(symbols) > 1:
+            best = None
+            best_rank = None
+            for i in range(len(symbols) - 1):
+                rank = ranks.get((symbols[i], symbols[i + 1]))
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best, best_rank = i, rank
+            if best is None:
+                break
+            pair = (symbols[best], symbols[best + 1])
+            merged = pair[0] + pair[1]
+            # Merge every occurrence of the best pair, left to right.
+            out = []
+            i = 0
+            while i < len(symbols):
+                if i < len(symbols) - 1 and (symbols[i], symbols[i + 1]) == pair:
+                    out.append(merged)
+                    i += 2
+                else:
+                    out.append(symbols[i])
+                    i += 1
+            symbols = out
+        return len(symbols)
+
+    def count(self, content: str, kind: str = "prose") -> int:
+        piece_count = self._piece_count
+        return sum(piece_count(m.group()) for m in _PRETOKENIZE_RE.finditer(content))
+
+
+class CachedEstimator:
+    """Wraps an estimator with an LRU cache keyed by content hash."""
+
+    def __init__(self, estimator, maxsize: int = 4096):
+        self.estimator = estimator
+        self.name = estimator.name
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+
+    def count(self, content: str, kind: str = "prose") -> int:
+        digest = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16)
+        key = (kind, digest.digest())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        result = self.estimator.count(content, kind)
+        self._cache[key] = result
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return result
+
+
+ESTIMATORS = {
+    "words": WordCountEstimator,
+    "heuristic": HeuristicEstimator,
+    "bpe": lambda: CachedEstimator(BpeEstimator()),
+}
+
+
+@lru_cache(maxsize=None)
+def get_estimator(name: str = DEFAULT_ESTIMATOR):
+    """Return the shared estimator instance registered under ``name``.
+
+    Raises:
+        ValueError: If ``name`` is not a known estimator.
+    """
+    try:
+        factory = ESTIMATORS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown token estimator {name!r}; expected one of {sorted(ESTIMATORS)}"
+        ) from None
+    return factory()
+
+
+def estimate_tokens(file_path: str, estimator: str = DEFAULT_ESTIMATOR) -> int:
+    """Estimate the token count for a file.
 
     Binary files or unreadable files return 0.
 
     Args:
         file_path: Path to the file.
+        estimator: Registered estimator name.
 
     Returns:
         Estimated token count as an integer.
     """
+    kind = content_kind(file_path)
+    backend = get_estimator(estimator)
+    if hasattr(backend, "count_file"):
+        return backend.count_file(file_path, kind)
+
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
@@ -29,5 +337,20 @@ def estimate_tokens(file_path: str) -> int:
         # Binary or unreadable file
         return 0
 
-    words = content.split()
-    return round(len(words) * 1.3)
+    return backend.count(content, kind)
+
+
+def estimate_tokens_from_text(
+    content: str, kind: str = "prose", estimator: str = DEFAULT_ESTIMATOR
+) -> int:
+    """Estimate the token count of already-decoded text.
+
+    Args:
+        content: Decoded file content.
+        kind: ``prose``, ``code`` or ``json`` (see ``content_kind``).
+        estimator: Registered estimator name.
+
+    Returns:
+        Estimated token count as an integer.
+    """
+    return get_estimator(estimator).count(content, kind)
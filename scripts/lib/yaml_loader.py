@@ -0,0 +1,28 @@
+"""YAML loading for docgen metadata.
+
+Uses PyYAML's libyaml-backed ``CSafeLoader`` when PyYAML was built with
+libyaml, and the pure-Python ``SafeLoader`` otherwise. Both construct the
+same safe types, so callers get identical results either way; all YAML
+parsing in ``scripts.lib`` goes through ``safe_load``.
+"""
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+
+def safe_load(stream):
+    """Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream: YAML text or an open file.
+
+    Returns:
+        The parsed document. Raises ``yaml.YAMLError`` on malformed input.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
@@ -5,13 +5,25 @@ Usage:
     python scripts/rebuild-doc-index.py             # Full rebuild
     python scripts/rebuild-doc-index.py --incremental  # Only modified files
     python scripts/rebuild-doc-index.py --verbose      # Verbose output
+    python scripts/rebuild-doc-index.py --jobs 4       # Parallel metadata extraction
+    python scripts/rebuild-doc-index.py --tokenizer bpe  # Exact BPE token counts
+    python scripts/rebuild-doc-index.py --no-cache       # Re-parse every file
+    python scripts/rebuild-doc-index.py --incremental --change-source git  # Files git reports
 
-Implemented in Story 1.6.
+Implemented in Story 1.6. Edge detection and glossary generation are not yet
+wired in; the rebuild currently populates the nodes table only.
 """
 
 import argparse
+import os
 import sys
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from scripts.lib.rebuild import CHANGE_SOURCES, rebuild_index  # noqa: E402
+from scripts.lib.token_estimator import DEFAULT_ESTIMATOR, ESTIMATORS  # noqa: E402
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(
@@ -20,16 +32,83 @@ def main() -> int:
     parser.add_argument(
         "--incremental",
         action="store_true",
-        help="Only process files modified since last run",
+        help="Only process files whose content changed since the last run",
+    )
+    parser.add_argument(
+        "--change-source",
+        choices=CHANGE_SOURCES,
+        default="walk",
+        help="How --incremental finds changed files: stat every walked file, or ask "
+        "git for paths changed since the last git-mode run (default: walk)",
     )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Show detailed output of what was indexed",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for metadata extraction; 0 uses all CPUs (default: 1)",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        choices=sorted(ESTIMATORS),
+        default=DEFAULT_ESTIMATOR,
+        help="Token estimator for token_estimate; run a full rebuild after "
+        f"switching (default: {DEFAULT_ESTIMATOR})",
+    )
+    parser.add_argument(
+        "--db-path",
+        default=os.path.join(REPO_ROOT, "docs", "_docgen", "repo-index.db"),
+        help="SQLite database path (default: docs/_docgen/repo-index.db)",
+    )
+    parser.add_argument(
+        "--cache-path",
+        default=os.path.join(REPO_ROOT, "docs", "_docgen", "metadata-cache.db"),
+        help="Parsed-metadata cache database (default: docs/_docgen/metadata-cache.db)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or update the metadata cache",
+    )
     args = parser.parse_args()
 
-    print("rebuild-doc-index: not yet implemented (Story 1.6)")
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    jobs = args.jobs or os.cpu_count() or 1
+
+    stats = rebuild_index(
+        REPO_ROOT,
+        args.db_path,
+        os.path.join(REPO_ROOT, "docs", "_docgen", "tier-rules.yaml"),
+        jobs=jobs,
+        incremental=args.incremental,
+        estimator=args.tokenizer,
+        cache_path=None if args.no_cache else args.cache_path,
+        change_source=args.change_source,
+    )
+
+    if args.verbose:
+        print(f"Files walked:    {stats.files_walked}")
+        for tier, count in stats.files_per_tier.items():
+            print(f"  Tier {tier}:        {count}")
+        if args.incremental:
+            print(f"Change source:   {stats.change_source}")
+            print(f"Unchanged:       {stats.files_unchanged}")
+            print(f"Touched:         {stats.files_touched}")
+        print(f"Nodes added:     {stats.nodes_added}")
+        print(f"Nodes updated:   {stats.nodes_updated}")
+        print(f"Nodes renamed:   {stats.nodes_renamed}")
+        print(f"Nodes deleted:   {stats.nodes_deleted}")
+        if not args.no_cache:
+            lookups = stats.cache_hits + stats.cache_misses
+            rate = stats.cache_hits / lookups if lookups else 0.0
+            print(f"Cache hits:      {stats.cache_hits}/{lookups} ({rate:.0%})")
+        print(f"Total time:      {stats.duration_seconds:.2f}s")
     return 0
 
 
@@ -0,0 +1,120 @@
+"""Tests for scripts.lib.budget_packing."""
+
+import random
+
+import pytest
+
+from scripts.lib.budget_packing import (
+    affinity_groups,
+    compute_budget,
+    lower_bound,
+    pack_files,
+    tier1_affinity,
+)
+from scripts.lib.graph_index import RepoGraph
+
+
+def _min_bins(sizes: list, capacity: int) -> int:
+    """Exhaustive minimum bin count for small inputs."""
+    best = len(sizes)
+
+    def place(i, caps):
+        nonlocal best
+        if len(caps) >= best:
+            return
+        if i == len(sizes):
+            best = len(caps)
+            return
+        for j, cap in enumerate(caps):
+            if cap >= sizes[i]:
+                caps[j] -= sizes[i]
+                place(i + 1, caps)
+                caps[j] += sizes[i]
+        caps.append(capacity - sizes[i])
+        place(i + 1, caps)
+        caps.pop()
+
+    place(0, [])
+    return best
+
+
+class TestComputeBudget:
+    def test_ratio_times_words(self):
+        assert compute_budget({"total_words": 2400, "source_budget_ratio": 2.5}) == 6000
+
+
+class TestAffinityGroups:
+    def test_shared_anchor_merges(self):
+        groups = affinity_groups(["a", "b", "c"], {"a": ["T"], "b": ["T"]})
+        assert groups == [["a", "b"], ["c"]]
+
+    def test_transitive(self):
+        groups = affinity_groups(["a", "b", "c"], {"a": ["T1"], "b": ["T1", "T2"], "c": ["T2"]})
+        assert groups == [["a", "b", "c"]]
+
+    def test_affinity_outside_file_set_ignored(self):
+        assert affinity_groups(["a"], {"z": ["T"]}) == [["a"]]
+
+    def test_tier1_affinity_from_graph(self):
+        graph = RepoGraph(["agent.md", "skill.md", "other.ts"], [("skill.md", "agent.md", "references")])
+        affinity = tier1_affinity(graph, ["agent.md", "skill.md", "other.ts"], ["agent.md"])
+        assert affinity == {"agent.md": ["agent.md"], "skill.md": ["agent.md"]}
+
+
+class TestLowerBound:
+    def test_large_items_need_own_bins(self):
+        # Three items > C/2 can never share a bin; L1 would say 2.
+        assert lower_bound([60, 60, 60], 100) == 3
+
+    def test_empty(self):
+        assert lower_bound([], 100) == 0
+
+
+class TestPackFiles:
+    def test_fits_in_one(self):
+        partition = pack_files({"a": 10, "b": 20}, 100)
+        assert partition.bins == [["a", "b"]]
+        assert partition.tokens == [30]
+        assert partition.optimal
+        assert partition.fits_budget
+
+    def test_affinity_kept_together(self):
+        tokens = {"a": 40, "b": 40, "c": 40}
+        partition = pack_files(tokens, 90, affinity={"a": ["T"], "c": ["T"]})
+        assert ["a", "c"] in partition.bins
+        assert all(total <= 90 for total in partition.tokens)
+
+    def test_oversized_group_reported(self):
+        partition = pack_files({"a": 80, "b": 80, "c": 10}, 100, affinity={"a": ["T"], "b": ["T"]})
+        assert partition.oversized == [0]
+        assert partition.bins[0] == ["a", "b"]
+        assert not partition.fits_budget
+
+    def test_none_tokens_count_as_zero(self):
+        assert pack_files({"a": None, "b": 5}, 10).tokens == [5]
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            pack_files({"a": 1}, 10, mode="fast")
+
+    def test_exact_beats_greedy(self):
+        # Best-fit decreasing needs 3 bins; 44+31+23 / 40+27+21 fits in 2.
+        tokens = {"a": 44, "b": 40, "c": 31, "d": 27, "e": 23, "f": 21}
+        assert len(pack_files(tokens, 100).bins) == 3
+        exact = pack_files(tokens, 100, mode="exact")
+        assert len(exact.bins) == 2
+        assert exact.optimal
+
+    @pytest.mark.parametrize("mode", ["greedy", "exact"])
+    def test_random_partitions_valid(self, mode):
+        rng = random.Random(7)
+        for _ in range(100):
+            capacity = rng.randint(10, 100)
+            tokens = {f"f{i}": rng.randint(0, capacity) for i in range(rng.randint(0, 9))}
+            partition = pack_files(tokens, capacity, mode=mode)
+            assert sorted(f for b in partition.bins for f in b) == sorted(tokens)
+            assert all(total <= capacity for total in partition.tokens)
+            optimum = _min_bins(sorted(tokens.values(), reverse=True), capacity)
+            assert partition.lower_bound <= optimum <= len(partition.bins)
+            if mode == "exact":
+                assert len(partition.bins) == optimum
@@ -0,0 +1,136 @@
+"""Tests for scripts.lib.file_ingest."""
+
+import hashlib
+import json
+import os
+
+import pytest
+
+from scripts.lib.file_ingest import FileRecord, ingest_file, ingest_files
+from scripts.lib.metadata_parser import (
+    get_last_modified,
+    parse_frontmatter,
+    parse_json_config,
+)
+from scripts.lib.tier_classifier import FileInfo
+from scripts.lib.token_estimator import estimate_tokens
+
+
+def _assert_matches_separate_calls(path: str, record: FileRecord) -> None:
+    """The single-read record must equal the per-function results."""
+    assert record.frontmatter == parse_frontmatter(path)
+    assert record.token_estimate == estimate_tokens(path)
+    assert record.last_modified == get_last_modified(path)
+    if path.endswith(".json"):
+        assert record.json_metadata == parse_json_config(path)
+    else:
+        assert record.json_metadata is None
+
+
+class TestIngestFile:
+    """ingest_file derives everything from one read."""
+
+    def test_markdown_with_frontmatter(self, tmp_path):
+        f = tmp_path / "story.md"
+        f.write_text("---\ntitle: Story\nid: s-1\n---\n# Heading\nBody text here\n")
+        record = ingest_file(str(f))
+        assert record.frontmatter == {"title": "Story", "id": "s-1"}
+        _assert_matches_separate_calls(str(f), record)
+
+    def test_markdown_without_frontmatter(self, tmp_path):
+        f = tmp_path / "plain.md"
+        f.write_text("# Heading\nno frontmatter\n")
+        record = ingest_file(str(f))
+        assert record.frontmatter is None
+        _assert_matches_separate_calls(str(f), record)
+
+    def test_crlf_line_endings(self, tmp_path):
+        f = tmp_path / "crlf.md"
+        f.write_bytes(b"---\r\ntitle: Windows\r\n---\r\nBody\r\n")
+        record = ingest_file(str(f))
+        assert record.frontmatter == {"title": "Windows"}
+        _assert_matches_separate_calls(str(f), record)
+
+    def test_package_json(self, tmp_path):
+        f = tmp_path / "package.json"
+        f.write_text(json.dumps({"name": "pkg", "version": "1.0.0", "scripts": {}}))
+        record = ingest_file(str(f))
+        assert record.json_metadata == {"name": "pkg", "version": "1.0.0"}
+        _assert_matches_separate_calls(str(f), record)
+
+    def test_malformed_json(self, tmp_path):
+        f = tmp_path / "bad.json"
+        f.write_text("{not json")
+        record = ingest_file(str(f))
+        assert record.json_metadata is None
+        _assert_matches_separate_calls(str(f), record)
+
+    def test_binary_file(self, tmp_path):
+        f = tmp_path / "blob.bin"
+        payload = b"\x00\x01\x80\xff\xfe" * 50
+        f.write_bytes(payload)
+        record = ingest_file(str(f))
+        assert record.token_estimate == 0
+        assert record.frontmatter is None
+        assert record.content_hash == hashlib.sha256(payload).hexdigest()
+
+    def test_hash_size_and_mtime(self, tmp_path):
+        f = tmp_path / "notes.txt"
+        f.write_text("alpha beta gamma")
+        os.utime(f, ns=(1_700_000_000_000_000_000, 1_700_000_000_123_456_789))
+        record = ingest_file(str(f))
+        assert record.size == len("alpha beta gamma")
+        assert record.mtime_ns == 1_700_000_000_123_456_789
+        assert record.content_hash == hashlib.sha256(b"alpha beta gamma").hexdigest()
+        _assert_matches_separate_calls(str(f), record)
+
+    def test_nonexistent_file_returns_none(self):
+        assert ingest_file("/no/such/file.md") is None
+
+    def test_reads_file_once(self, tmp_path, monkeypatch):
+        f = tmp_path / "doc.md"
+        f.write_text("---\ntitle: Once\n---\nbody\n")
+        opened = []
+        real_open = open
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(path)
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", counting_open)
+        ingest_file(str(f))
+        assert opened == [str(f)]
+
+
+class TestIngestFiles:
+    """ingest_files merges per-file records deterministically."""
+
+    @pytest.fixture
+    def file_infos(self, tmp_path):
+        infos = []
+        for i in range(12):
+            rel = f"docs/doc-{i:02d}.md"
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"---\ntitle: Doc {i}\n---\nword " * (i + 1))
+            infos.append(FileInfo(path=str(path), relative_path=rel, tier=3,
+                                  node_type="implementation"))
+        return infos
+
+    def test_sorted_by_relative_path(self, file_infos):
+        results = ingest_files(reversed(file_infos))
+        assert [fi.relative_path for fi, _ in results] == sorted(
+            fi.relative_path for fi in file_infos
+        )
+
+    def test_process_pool_matches_serial(self, file_infos):
+        serial = ingest_files(file_infos, jobs=1)
+        parallel = ingest_files(file_infos, jobs=2, batch_size=5)
+        assert parallel == serial
+
+    def test_unreadable_files_omitted(self, file_infos):
+        missing = FileInfo(path="/no/such/file.md", relative_path="missing.md",
+                           tier=3, node_type="implementation")
+        results = ingest_files(file_infos + [missing])
+        assert "missing.md" not in {fi.relative_path for fi, _ in results}
+        assert len(results) == len(file_infos)
@@ -0,0 +1,111 @@
+"""Tests for scripts.lib.graph_index."""
+
+from scripts.lib.graph_index import RepoGraph, expansion_path
+from scripts.lib.index_writer import IndexWriter
+
+# db fixture provided by conftest.py
+
+
+def _graph(edges, extra_nodes=()):
+    ids = {n for s, t, _ in edges for n in (s, t)} | set(extra_nodes)
+    return RepoGraph(sorted(ids), edges)
+
+
+CHAIN = [
+    ("a", "b", "references"),
+    ("b", "c", "references"),
+    ("c", "d", "references"),
+    ("a", "x", "depends_on"),
+    ("x", "y", "depends_on"),
+]
+
+
+class TestRepoGraph:
+    """CSR adjacency is built per edge type and direction."""
+
+    def test_neighbors_sorted_per_type(self):
+        graph = _graph([("a", "c", "imports"), ("a", "b", "imports"), ("a", "d", "touches")])
+        assert graph.neighbors("a", "imports") == ["b", "c"]
+        assert graph.neighbors("a", "touches") == ["d"]
+        assert graph.neighbors("b", "imports") == []
+        assert graph.neighbors("b", "imports", incoming=True) == ["a"]
+
+    def test_unknown_node_or_type(self):
+        graph = _graph(CHAIN)
+        assert graph.neighbors("missing", "references") == []
+        assert graph.neighbors("a", "missing") == []
+
+    def test_counts(self):
+        graph = _graph(CHAIN, extra_nodes=["isolated"])
+        assert graph.node_count == 7
+        assert graph.edge_count == 5
+        assert graph.edge_types == ["depends_on", "references"]
+
+    def test_from_db(self, db):
+        with IndexWriter(db) as writer:
+            for node_id in ("a", "b", "c"):
+                writer.add_node((node_id, 3, "implementation", node_id, 10, None, "2024-01-01"))
+            writer.add_edge("a", "b", "imports")
+            writer.add_edge("b", "c", "imports")
+        graph = RepoGraph.from_db(db)
+        assert graph.node_count == 3
+        assert graph.neighbors("a", "imports") == ["b"]
+        assert graph.neighbors("c", "imports", incoming=True) == ["b"]
+
+
+class TestExpand:
+    """One BFS honours every edge type's depth cap."""
+
+    def test_default_caps(self):
+        steps = _graph(CHAIN).expand(["a"])
+        # references capped at 2 hops, depends_on at 1
+        assert list(steps) == ["a", "x", "b", "c"]
+        assert steps["c"].depth == 2
+        assert steps["x"].edge_type == "depends_on"
+
+    def test_custom_caps(self):
+        steps = _graph(CHAIN).expand(["a"], {"references": 3})
+        assert set(steps) == {"a", "b", "c", "d"}
+
+    def test_uncapped_types_not_followed(self):
+        steps = _graph(CHAIN).expand(["a"], {"depends_on": 5})
+        assert set(steps) == {"a", "x", "y"}
+
+    def test_mixed_path_respects_cap_per_hop(self):
+        # depends_on may only be the first hop, even after a references hop.
+        edges = [("a", "b", "references"), ("b", "c", "depends_on")]
+        steps = _graph(edges).expand(["a"], {"references": 2, "depends_on": 1})
+        assert set(steps) == {"a", "b"}
+
+    def test_shortest_path_kept(self):
+        edges = [("a", "b", "references"), ("b", "c", "references"), ("a", "c", "imports")]
+        steps = _graph(edges).expand(["a"])
+        assert steps["c"].depth == 1
+        assert steps["c"].edge_type == "imports"
+
+    def test_multiple_seeds(self):
+        edges = [("a", "b", "references"), ("c", "d", "references")]
+        steps = _graph(edges).expand(["a", "c", "unknown"])
+        assert steps["b"].seed == "a"
+        assert steps["d"].seed == "c"
+        assert "unknown" not in steps
+
+    def test_incoming_edges(self):
+        edges = [("story", "src", "touches")]
+        assert set(_graph(edges).expand(["src"])) == {"src"}
+        steps = _graph(edges).expand(["src"], include_incoming=True)
+        assert steps["story"].parent == "src"
+
+    def test_cycles_terminate(self):
+        edges = [("a", "b", "imports"), ("b", "a", "imports")]
+        steps = _graph(edges).expand(["a"], {"imports": 10})
+        assert set(steps) == {"a", "b"}
+
+
+class TestExpansionPath:
+    """Paths are reconstructed from parent links for the traversal log."""
+
+    def test_path(self):
+        steps = _graph(CHAIN).expand(["a"])
+        assert expansion_path(steps, "c") == [("a", "references", "b"), ("b", "references", "c")]
+        assert expansion_path(steps, "a") == []
@@ -0,0 +1,91 @@
+"""Tests for scripts.lib.index_writer."""
+
+import pytest
+
+from scripts.lib.index_writer import IndexWriter
+
+# db fixture provided by conftest.py
+
+
+def _node(node_id: str) -> tuple:
+    return (node_id, 3, "implementation", node_id, 10, None, "2024-01-01T00:00:00+00:00")
+
+
+def _count(db, table: str) -> int:
+    return db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestIndexWriter:
+    """Staged rows are written in batches with foreign keys satisfied."""
+
+    def test_close_flushes_everything(self, db):
+        with IndexWriter(db) as writer:
+            writer.add_node(_node("a.ts"))
+            writer.add_node(_node("b.ts"))
+            writer.add_edge("a.ts", "b.ts", "imports")
+            writer.add_manifest(("a.ts", 1, 2, 3, "hash"))
+        assert _count(db, "nodes") == 2
+        assert _count(db, "edges") == 1
+        assert _count(db, "file_manifest") == 1
+        assert writer.nodes_written == 2
+        assert writer.edges_written == 1
+
+    def test_nothing_written_before_flush(self, db):
+        writer = IndexWriter(db, batch_size=100)
+        writer.add_node(_node("a.ts"))
+        assert _count(db, "nodes") == 0
+        writer.close()
+        assert _count(db, "nodes") == 1
+
+    def test_flushes_at_batch_size(self, db):
+        writer = IndexWriter(db, batch_size=3)
+        for i in range(7):
+            writer.add_node(_node(f"f{i}.ts"))
+        assert _count(db, "nodes") == 6
+        writer.close()
+        assert _count(db, "nodes") == 7
+
+    def test_nodes_written_before_edges_in_same_batch(self, db):
+        with IndexWriter(db) as writer:
+            writer.add_edge("a.ts", "b.ts", "imports")
+            writer.add_node(_node("a.ts"))
+            writer.add_node(_node("b.ts"))
+        assert _count(db, "edges") == 1
+
+    def test_duplicate_edges_ignored(self, db):
+        with IndexWriter(db) as writer:
+            writer.add_node(_node("a.ts"))
+            writer.add_node(_node("b.ts"))
+            writer.add_edge("a.ts", "b.ts", "imports")
+            writer.add_edge("a.ts", "b.ts", "imports")
+        assert _count(db, "edges") == 1
+
+    def test_node_upsert_replaces_columns(self, db):
+        with IndexWriter(db) as writer:
+            writer.add_node(_node("a.ts"))
+            writer.add_node(("a.ts", 1, "story", "A", 5, None, None))
+        assert db.execute("SELECT tier, type FROM nodes").fetchall() == [(1, "story")]
+
+    def test_exception_discards_staged_rows(self, db):
+        with pytest.raises(RuntimeError):
+            with IndexWriter(db) as writer:
+                writer.add_node(_node("a.ts"))
+                raise RuntimeError("boom")
+        assert _count(db, "nodes") == 0
+
+
+class TestBulkMode:
+    """bulk=True relaxes durability while open and analyzes on close."""
+
+    def test_pragmas_relaxed_then_restored(self, db):
+        before = db.execute("PRAGMA synchronous").fetchone()[0]
+        with IndexWriter(db, bulk=True):
+            assert db.execute("PRAGMA synchronous").fetchone()[0] == 0
+            assert db.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert db.execute("PRAGMA synchronous").fetchone()[0] == before
+
+    def test_analyze_on_close(self, db):
+        with IndexWriter(db, bulk=True) as writer:
+            writer.add_node(_node("a.ts"))
+        tables = {row[0] for row in db.execute("SELECT name FROM sqlite_master")}
+        assert "sqlite_stat1" in tables
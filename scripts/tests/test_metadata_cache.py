@@ -0,0 +1,95 @@
+"""Tests for scripts.lib.metadata_cache."""
+
+import sqlite3
+
+import pytest
+
+from scripts.lib import metadata_cache
+from scripts.lib.file_ingest import ingest_file, ingest_files
+from scripts.lib.metadata_cache import MetadataCache, cache_variant
+from scripts.lib.rebuild import rebuild_index
+from scripts.lib.tier_classifier import FileInfo
+from scripts.tests.test_rebuild import RULES_PATH, _dump_nodes, mock_repo  # noqa: F401
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def _write(tmp_path, name: str, content: str) -> str:
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+def _file_info(path: str) -> FileInfo:
+    return FileInfo(path=path, relative_path=path.rsplit("/", 1)[1], tier=3, node_type="other")
+
+
+class TestMetadataCache:
+    """Entries are keyed by content hash and variant and survive reopening."""
+
+    def test_miss_then_hit(self, tmp_path, cache_path):
+        path = _write(tmp_path, "a.md", "---\ntitle: A\nupdated: 2024-01-02\n---\nBody\n")
+        with MetadataCache(cache_path) as cache:
+            cold = ingest_files([_file_info(path)], cache=cache)[0][1]
+            assert (cache.hits, cache.misses) == (0, 1)
+        with MetadataCache(cache_path) as cache:
+            warm = ingest_files([_file_info(path)], cache=cache)[0][1]
+            assert (cache.hits, cache.misses) == (1, 0)
+            assert cache.hit_rate == 1.0
+        assert warm.cache_hit and not cold.cache_hit
+        assert warm.token_estimate == cold.token_estimate
+        # Dates round-trip as strings, as the index stores them.
+        assert warm.frontmatter == {"title": "A", "updated": "2024-01-02"}
+
+    def test_same_content_different_extension(self, tmp_path, cache_path):
+        content = '{"name": "pkg", "version": "1.0.0"}'
+        as_json = _write(tmp_path, "package.json", content)
+        as_text = _write(tmp_path, "notes.md", content)
+        assert cache_variant(as_json, "heuristic") != cache_variant(as_text, "heuristic")
+        with MetadataCache(cache_path) as cache:
+            ingest_files([_file_info(as_json)], cache=cache)
+        with MetadataCache(cache_path) as cache:
+            record = ingest_file(as_text, cache=cache)
+        assert not record.cache_hit
+        assert record.json_metadata is None
+
+    def test_parser_version_change_clears(self, tmp_path, cache_path, monkeypatch):
+        path = _write(tmp_path, "a.md", "text\n")
+        with MetadataCache(cache_path) as cache:
+            ingest_files([_file_info(path)], cache=cache)
+        monkeypatch.setattr(metadata_cache, "PARSER_VERSION", "changed")
+        with MetadataCache(cache_path) as cache:
+            assert not ingest_file(path, cache=cache).cache_hit
+
+    def test_lru_eviction(self, tmp_path, cache_path):
+        paths = [_write(tmp_path, f"f{i}.md", f"file {i}\n") for i in range(3)]
+        with MetadataCache(cache_path, max_entries=2) as cache:
+            ingest_files([_file_info(p) for p in paths[:2]], cache=cache)
+        with MetadataCache(cache_path, max_entries=2) as cache:
+            ingest_files([_file_info(paths[0])], cache=cache)  # f0 now most recent
+        with MetadataCache(cache_path, max_entries=2) as cache:
+            ingest_files([_file_info(paths[2])], cache=cache)  # evicts f1
+        conn = sqlite3.connect(cache_path)
+        assert conn.execute("SELECT COUNT(*) FROM metadata_cache").fetchone()[0] == 2
+        conn.close()
+        with MetadataCache(cache_path, max_entries=2) as cache:
+            assert ingest_file(paths[0], cache=cache).cache_hit
+            assert not ingest_file(paths[1], cache=cache).cache_hit
+
+
+class TestRebuildWithCache:
+    """A warm cache produces the same index as no cache."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_warm_rebuild_identical(self, mock_repo, tmp_path, cache_path, jobs):  # noqa: F811
+        plain = str(tmp_path / "plain.db")
+        rebuild_index(mock_repo, plain, RULES_PATH)
+        cold = rebuild_index(mock_repo, str(tmp_path / "cold.db"), RULES_PATH, cache_path=cache_path)
+        warm_db = str(tmp_path / "warm.db")
+        warm = rebuild_index(mock_repo, warm_db, RULES_PATH, jobs=jobs, cache_path=cache_path)
+        assert cold.cache_hits == 0 and cold.cache_misses == cold.files_walked
+        assert warm.cache_hits == warm.files_walked and warm.cache_misses == 0
+        assert _dump_nodes(warm_db) == _dump_nodes(plain)
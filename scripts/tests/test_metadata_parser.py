@@ -9,6 +9,7 @@ from scripts.lib.metadata_parser import (
     extract_name,
     get_last_modified,
     parse_frontmatter,
+    parse_frontmatter_content,
     parse_json_config,
     should_upgrade_tier,
 )
@@ -80,6 +81,38 @@ class TestParseFrontmatter:
         assert json.loads(serialized) == result
 
 
+class TestParseFrontmatterStreaming:
+    """Streaming behaviour: stop at the closing delimiter, bounded size."""
+
+    def test_exceeding_max_size_returns_none(self, tmp_path):
+        f = tmp_path / "huge.md"
+        f.write_text("---\n" + "key: value\n" * 100 + "---\n")
+        assert parse_frontmatter(str(f), max_size=50) is None
+        assert parse_frontmatter(str(f), max_size=None) == {"key": "value"}
+
+    def test_leading_whitespace_before_delimiter(self, tmp_path):
+        """The opening line is compared after strip(), so it is not fast-rejected."""
+        f = tmp_path / "indented.md"
+        f.write_text("  ---\ntitle: Indented\n---\n")
+        assert parse_frontmatter(str(f)) == {"title": "Indented"}
+
+    def test_crlf_delimiters(self, tmp_path):
+        f = tmp_path / "crlf.md"
+        f.write_bytes(b"---\r\ntitle: CRLF\r\n---\r\nBody\r\n")
+        assert parse_frontmatter(str(f)) == {"title": "CRLF"}
+
+    def test_empty_file(self, tmp_path):
+        f = tmp_path / "empty.md"
+        f.write_text("")
+        assert parse_frontmatter(str(f)) is None
+
+    def test_content_variant_matches_file_variant(self, tmp_path):
+        text = "---\ntitle: Same\nrole: doc\n---\n# Body\n"
+        f = tmp_path / "same.md"
+        f.write_text(text)
+        assert parse_frontmatter_content(text) == parse_frontmatter(str(f))
+
+
 # ---------------------------------------------------------------------------
 # parse_json_config
 # ---------------------------------------------------------------------------
@@ -0,0 +1,213 @@
+"""Integration tests for the rebuild pipeline."""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from scripts.lib.rebuild import rebuild_index
+
+RULES_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "docs", "_docgen", "tier-rules.yaml"
+)
+
+
+@pytest.fixture
+def mock_repo(tmp_path):
+    """A small repository with representative files in each tier."""
+    root = tmp_path / "repo"
+    files = {
+        "README.md": "# Project\n",
+        "docs/stories/story-1.md": "---\ntitle: Story One\n---\nStory body text\n",
+        "docs/guide.md": "---\nid: guide\nupdated: 2024-01-02\n---\nGuide\n",
+        "package.json": json.dumps({"name": "mock", "version": "1.0.0"}),
+        "src/index.ts": "export {}\n",
+        "src/handler.ts": "export const handler = () => {}\n",
+        "node_modules/pkg/index.js": "module.exports = {}\n",
+        "assets/logo.png": "",
+    }
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return str(root)
+
+
+def _rebuild(repo: str, tmp_path, name: str = "index.db", jobs: int = 1) -> str:
+    db_path = str(tmp_path / name)
+    rebuild_index(repo, db_path, RULES_PATH, jobs=jobs)
+    return db_path
+
+
+def _dump_nodes(db_path: str) -> list:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT * FROM nodes ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+class TestFullRebuild:
+    """Full rebuild populates the nodes table from the repository."""
+
+    def test_nodes_populated(self, mock_repo, tmp_path):
+        nodes = {row[0]: row for row in _dump_nodes(_rebuild(mock_repo, tmp_path))}
+        assert set(nodes) == {
+            "README.md",
+            "docs/stories/story-1.md",
+            "docs/guide.md",
+            "package.json",
+            "src/index.ts",
+            "src/handler.ts",
+        }
+
+    def test_node_columns(self, mock_repo, tmp_path):
+        nodes = {row[0]: row for row in _dump_nodes(_rebuild(mock_repo, tmp_path))}
+        _, tier, node_type, name, tokens, frontmatter, last_modified = nodes[
+            "docs/stories/story-1.md"
+        ]
+        assert (tier, node_type, name) == (1, "story", "Story One")
+        assert tokens > 0
+        assert json.loads(frontmatter) == {"title": "Story One"}
+        assert last_modified.endswith("+00:00")
+
+    def test_frontmatter_tier_upgrade(self, mock_repo, tmp_path):
+        nodes = {row[0]: row for row in _dump_nodes(_rebuild(mock_repo, tmp_path))}
+        assert nodes["docs/guide.md"][1] == 1
+
+    def test_yaml_dates_stored_as_strings(self, mock_repo, tmp_path):
+        nodes = {row[0]: row for row in _dump_nodes(_rebuild(mock_repo, tmp_path))}
+        assert json.loads(nodes["docs/guide.md"][5])["updated"] == "2024-01-02"
+
+    def test_stats(self, mock_repo, tmp_path):
+        stats = rebuild_index(mock_repo, str(tmp_path / "s.db"), RULES_PATH)
+        assert stats.files_walked == 6
+        assert stats.nodes_written == 6
+        assert stats.files_per_tier == {1: 3, 2: 2, 3: 1}
+
+    def test_rebuild_replaces_stale_nodes(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        os.remove(os.path.join(mock_repo, "src", "handler.ts"))
+        rebuild_index(mock_repo, db_path, RULES_PATH)
+        assert "src/handler.ts" not in {row[0] for row in _dump_nodes(db_path)}
+
+
+class TestDeterminism:
+    """Same repository state produces identical data."""
+
+    def test_two_rebuilds_identical(self, mock_repo, tmp_path):
+        first = _dump_nodes(_rebuild(mock_repo, tmp_path, "a.db"))
+        second = _dump_nodes(_rebuild(mock_repo, tmp_path, "b.db"))
+        assert first == second
+
+    def test_parallel_extraction_identical(self, mock_repo, tmp_path):
+        serial = _dump_nodes(_rebuild(mock_repo, tmp_path, "serial.db"))
+        parallel = _dump_nodes(_rebuild(mock_repo, tmp_path, "parallel.db", jobs=2))
+        assert parallel == serial
+
+
+def _incremental(repo: str, db_path: str):
+    return rebuild_index(repo, db_path, RULES_PATH, incremental=True)
+
+
+def _dump_edges(db_path: str) -> list:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT * FROM edges ORDER BY source_id, target_id").fetchall()
+    finally:
+        conn.close()
+
+
+def _add_edge(db_path: str, source: str, target: str) -> None:
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(
+            "INSERT INTO edges (source_id, target_id, edge_type) VALUES (?, ?, 'references')",
+            (source, target),
+        )
+    conn.close()
+
+
+class TestIncrementalRebuild:
+    """Incremental rebuild driven by the content-hash manifest."""
+
+    def test_manifest_populated_by_full_rebuild(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        conn = sqlite3.connect(db_path)
+        paths = {row[0] for row in conn.execute("SELECT path FROM file_manifest")}
+        conn.close()
+        assert paths == {row[0] for row in _dump_nodes(db_path)}
+
+    def test_noop_reads_nothing(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        stats = _incremental(mock_repo, db_path)
+        assert stats.files_unchanged == 6
+        assert stats.nodes_written == 0
+        assert stats.nodes_deleted == 0
+
+    def test_mtime_change_without_content_change(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        os.utime(os.path.join(mock_repo, "README.md"), ns=(0, 1_000_000_000))
+        stats = _incremental(mock_repo, db_path)
+        assert stats.files_touched == 1
+        assert stats.nodes_updated == 0
+
+    def test_modified_file_updated(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        _add_edge(db_path, "src/handler.ts", "src/index.ts")
+        _add_edge(db_path, "src/index.ts", "src/handler.ts")
+        with open(os.path.join(mock_repo, "src", "handler.ts"), "a") as f:
+            f.write("export const more = 1\n")
+        stats = _incremental(mock_repo, db_path)
+        assert stats.nodes_updated == 1
+        # Outgoing edges of the changed file are invalidated; incoming kept
+        assert _dump_edges(db_path) == [("src/index.ts", "src/handler.ts", "references")]
+
+    def test_added_file(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        with open(os.path.join(mock_repo, "src", "new.ts"), "w") as f:
+            f.write("export const fresh = true\n")
+        stats = _incremental(mock_repo, db_path)
+        assert stats.nodes_added == 1
+        assert "src/new.ts" in {row[0] for row in _dump_nodes(db_path)}
+
+    def test_deleted_file_removed_with_edges(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        _add_edge(db_path, "src/index.ts", "src/handler.ts")
+        os.remove(os.path.join(mock_repo, "src", "handler.ts"))
+        stats = _incremental(mock_repo, db_path)
+        assert stats.nodes_deleted == 1
+        assert "src/handler.ts" not in {row[0] for row in _dump_nodes(db_path)}
+        assert _dump_edges(db_path) == []
+
+    def test_rename_detected_by_hash(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path)
+        _add_edge(db_path, "src/index.ts", "src/handler.ts")
+        os.rename(
+            os.path.join(mock_repo, "src", "handler.ts"),
+            os.path.join(mock_repo, "src", "renamed.ts"),
+        )
+        stats = _incremental(mock_repo, db_path)
+        assert stats.nodes_renamed == 1
+        assert stats.nodes_added == 0
+        assert stats.nodes_deleted == 0
+        assert _dump_edges(db_path) == [("src/index.ts", "src/renamed.ts", "references")]
+
+    def test_incremental_matches_full_rebuild(self, mock_repo, tmp_path):
+        db_path = _rebuild(mock_repo, tmp_path, "incremental.db")
+        with open(os.path.join(mock_repo, "docs", "guide.md"), "w") as f:
+            f.write("---\ntitle: Rewritten Guide\n---\nNew body\n")
+        os.remove(os.path.join(mock_repo, "src", "handler.ts"))
+        os.rename(
+            os.path.join(mock_repo, "README.md"),
+            os.path.join(mock_repo, "docs", "README.md"),
+        )
+        _incremental(mock_repo, db_path)
+        assert _dump_nodes(db_path) == _dump_nodes(_rebuild(mock_repo, tmp_path, "full.db"))
+
+    def test_incremental_on_empty_database(self, mock_repo, tmp_path):
+        db_path = str(tmp_path / "fresh.db")
+        stats = _incremental(mock_repo, db_path)
+        assert stats.nodes_added == 6
+        assert _dump_nodes(db_path) == _dump_nodes(_rebuild(mock_repo, tmp_path, "full.db"))
@@ -1,17 +1,23 @@
 """Tests for the SQLite schema creation module."""
 
+import os
 import sqlite3
 
 import pytest
 
-from scripts.lib.schema import create_schema
+from scripts.lib.schema import (
+    SCHEMA_VERSION,
+    create_schema,
+    get_schema_version,
+    replace_database,
+)
 
 
 # db fixture provided by conftest.py
 
 
 class TestTableCreation:
-    """Verify all 5 tables are created."""
+    """Verify all 8 tables are created."""
 
     EXPECTED_TABLES = [
         "nodes",
@@ -19,6 +25,9 @@ class TestTableCreation:
         "glossary_canonical",
         "glossary_variants",
         "glossary_forbidden",
+        "file_manifest",
+        "index_state",
+        "schema_version",
     ]
 
     def test_all_tables_exist(self, db):
@@ -29,12 +38,12 @@ class TestTableCreation:
         for table in self.EXPECTED_TABLES:
             assert table in tables, f"Table '{table}' not found in database"
 
-    def test_exactly_five_tables(self, db):
+    def test_exactly_eight_tables(self, db):
         cursor = db.execute(
             "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
         )
         tables = [row[0] for row in cursor.fetchall()]
-        assert len(tables) == 5, f"Expected 5 tables, found {len(tables)}: {tables}"
+        assert len(tables) == 8, f"Expected 8 tables, found {len(tables)}: {tables}"
 
 
 class TestNodesTable:
@@ -269,6 +278,133 @@ class TestGlossaryForbiddenTable:
         assert cursor.fetchone()[0] == 1
 
 
+class TestFileManifestTable:
+    """Verify file_manifest table columns and constraints."""
+
+    def test_file_manifest_columns(self, db):
+        cursor = db.execute("PRAGMA table_info(file_manifest)")
+        columns = {row[1]: row[2] for row in cursor.fetchall()}
+        expected = {
+            "path": "TEXT",
+            "size": "INTEGER",
+            "mtime_ns": "INTEGER",
+            "inode": "INTEGER",
+            "content_hash": "TEXT",
+        }
+        assert columns == expected
+
+    def test_file_manifest_foreign_key(self, db):
+        """path must reference an existing node."""
+        with pytest.raises(sqlite3.IntegrityError):
+            db.execute(
+                "INSERT INTO file_manifest (path, size, mtime_ns, inode, content_hash) "
+                "VALUES ('missing.md', 1, 1, 1, 'abc')"
+            )
+
+    def test_file_manifest_valid_insert(self, db):
+        db.execute("INSERT INTO nodes (id, tier, type) VALUES ('a.md', 3, 'implementation')")
+        db.execute(
+            "INSERT INTO file_manifest (path, size, mtime_ns, inode, content_hash) "
+            "VALUES ('a.md', 10, 1700000000000000000, 42, 'deadbeef')"
+        )
+        cursor = db.execute("SELECT COUNT(*) FROM file_manifest")
+        assert cursor.fetchone()[0] == 1
+
+
+class TestSchemaVersioning:
+    """Schema version tracking and in-place migration."""
+
+    LEGACY_DDL = """
+        CREATE TABLE nodes (
+            id TEXT PRIMARY KEY, tier INTEGER NOT NULL, type TEXT NOT NULL,
+            name TEXT, token_estimate INTEGER, frontmatter TEXT, last_modified TEXT
+        );
+        CREATE TABLE edges (
+            source_id TEXT NOT NULL, target_id TEXT NOT NULL, edge_type TEXT NOT NULL,
+            UNIQUE (source_id, target_id, edge_type),
+            FOREIGN KEY (source_id) REFERENCES nodes(id),
+            FOREIGN KEY (target_id) REFERENCES nodes(id)
+        );
+        INSERT INTO nodes (id, tier, type) VALUES ('a.md', 1, 'story');
+        INSERT INTO nodes (id, tier, type) VALUES ('b.md', 1, 'story');
+        INSERT INTO edges VALUES ('a.md', 'b.md', 'references');
+    """
+
+    def test_new_database_at_latest_version(self, db):
+        assert get_schema_version(db) == SCHEMA_VERSION
+
+    def test_single_version_row(self, db):
+        assert db.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == 1
+
+    def test_indexes_created(self, db):
+        indexes = {
+            row[0]
+            for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert {"idx_edges_target_type", "idx_edges_type_source", "idx_nodes_tier_type"} <= indexes
+
+    def test_unversioned_database_upgraded_in_place(self, tmp_path):
+        path = str(tmp_path / "legacy.db")
+        legacy = sqlite3.connect(path)
+        legacy.executescript(self.LEGACY_DDL)
+        legacy.close()
+
+        conn = create_schema(path)
+        assert get_schema_version(conn) == SCHEMA_VERSION
+        # Existing data survives the migration
+        assert conn.execute("SELECT * FROM edges").fetchall() == [("a.md", "b.md", "references")]
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(edges)")}
+        assert "idx_edges_target_type" in indexes
+        conn.close()
+
+    def test_reopening_does_not_rerun_migrations(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        create_schema(path).close()
+        conn = create_schema(path)
+        assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == 1
+        conn.close()
+
+
+class TestTraversalQueryPlans:
+    """Graph traversal queries must be answered from indexes, not table scans."""
+
+    @staticmethod
+    def _plan(db, sql: str, params: tuple) -> str:
+        rows = db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return " | ".join(row[-1] for row in rows)
+
+    def test_reverse_lookup_by_type(self, db):
+        plan = self._plan(
+            db, "SELECT source_id FROM edges WHERE target_id = ? AND edge_type = ?",
+            ("a.md", "references"),
+        )
+        assert "COVERING INDEX idx_edges_target_type" in plan
+
+    def test_reverse_lookup_any_type(self, db):
+        plan = self._plan(
+            db, "SELECT source_id, edge_type FROM edges WHERE target_id = ?", ("a.md",)
+        )
+        assert "COVERING INDEX idx_edges_target_type" in plan
+
+    def test_forward_lookup_by_type(self, db):
+        plan = self._plan(
+            db, "SELECT target_id FROM edges WHERE source_id = ? AND edge_type = ?",
+            ("a.md", "references"),
+        )
+        assert "SCAN" not in plan
+        assert "INDEX" in plan
+
+    def test_scan_by_edge_type(self, db):
+        plan = self._plan(
+            db, "SELECT source_id, target_id FROM edges WHERE edge_type = ?", ("imports",)
+        )
+        assert "COVERING INDEX idx_edges_type_source" in plan
+
+    def test_nodes_by_tier_and_type(self, db):
+        plan = self._plan(db, "SELECT id FROM nodes WHERE tier = ? AND type = ?", (1, "story"))
+        assert "INDEX idx_nodes_tier_type" in plan
+
+
 class TestSchemaIdempotency:
     """Running create_schema twice should not error."""
 
@@ -290,7 +426,7 @@ class TestSchemaIdempotency:
                 "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
             )
             tables = [row[0] for row in cursor.fetchall()]
-            assert len(tables) == 5
+            assert len(tables) == 7
             conn2.close()
         finally:
             os.unlink(path)
@@ -328,3 +464,62 @@ class TestForeignKeysEnabled:
         cursor = db.execute("PRAGMA foreign_keys")
         result = cursor.fetchone()[0]
         assert result == 1, "Foreign keys should be enabled"
+
+
+class TestReplaceDatabase:
+    """replace_database swaps a built database into place atomically."""
+
+    @staticmethod
+    def _built(node_id: str) -> sqlite3.Connection:
+        conn = create_schema(":memory:")
+        with conn:
+            conn.execute(
+                "INSERT INTO nodes (id, tier, type) VALUES (?, 1, 'story')", (node_id,)
+            )
+        return conn
+
+    @staticmethod
+    def _node_ids(path: str) -> list:
+        conn = sqlite3.connect(path)
+        try:
+            return [row[0] for row in conn.execute("SELECT id FROM nodes")]
+        finally:
+            conn.close()
+
+    def test_creates_new_database(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        source = self._built("new.md")
+        replace_database(source, path)
+        source.close()
+        assert self._node_ids(path) == ["new.md"]
+
+    def test_replaces_existing_wal_database(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        live = create_schema(path)
+        with live:
+            live.execute("INSERT INTO nodes (id, tier, type) VALUES ('old.md', 1, 'story')")
+        live.close()
+
+        source = self._built("new.md")
+        replace_database(source, path)
+        source.close()
+
+        reopened = create_schema(path)
+        assert reopened.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert [row[0] for row in reopened.execute("SELECT id FROM nodes")] == ["new.md"]
+        reopened.close()
+
+    def test_in_use_database_left_untouched(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        live = create_schema(path)
+        with live:
+            live.execute("INSERT INTO nodes (id, tier, type) VALUES ('old.md', 1, 'story')")
+
+        source = self._built("new.md")
+        with pytest.raises(sqlite3.OperationalError):
+            replace_database(source, path, timeout=0.1)
+        source.close()
+        live.close()
+
+        assert self._node_ids(path) == ["old.md"]
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -7,7 +7,9 @@ import pytest
 import yaml
 
 from scripts.lib.tier_classifier import (
+    CompiledTierRules,
     FileInfo,
+    _match_glob,
     classify_tier,
     derive_node_type,
     load_tier_rules,
@@ -403,6 +405,125 @@ class TestLoadTierRules:
         assert isinstance(tier_rules["tier_3"], list)
 
 
+# ===========================================================================
+# Test: CompiledTierRules
+# ===========================================================================
+
+class TestCompiledTierRules:
+    """Compiled rules must classify exactly like per-pattern evaluation."""
+
+    SAMPLE_PATHS = [
+        ".claude/skills/review/SKILL.md",
+        ".claude/skills/review/notes.txt",
+        ".claude/skillsX/a.md",
+        ".claude/hooks/bash-guard.sh",
+        "docs/adr/adr-001.md",
+        "docs/adr/nested/adr-002.md",
+        "docs/stories/story-1-1.md",
+        "README.md",
+        "a/b/c/README.md",
+        "package.json",
+        "frontend/package.json",
+        "tsconfig.build.json",
+        "infra/jest.config.ts",
+        "shared/types/index.d.ts",
+        "src/index.ts",
+        ".github/workflows/ci.yml",
+        "src/handler.ts",
+        "node_modules/pkg/index.js",
+        "src/coverage",
+        "logo.png",
+        "nested/package-lock.json",
+        ".env",
+    ]
+
+    def test_matches_per_pattern_evaluation(self, tier_rules):
+        compiled = CompiledTierRules(tier_rules)
+        for path in self.SAMPLE_PATHS:
+            assert compiled.classify(path) == _reference_tier(path, tier_rules), path
+
+    def test_classify_tier_accepts_compiled(self, tier_rules):
+        compiled = CompiledTierRules(tier_rules)
+        assert classify_tier("README.md", compiled) == 1
+        assert classify_tier("package.json", compiled) == 2
+        assert classify_tier("src/handler.ts", compiled) == 3
+        assert classify_tier("dist/bundle.js", compiled) == 4
+
+    def test_empty_rules_default_to_tier_3(self):
+        assert CompiledTierRules({}).classify("anything/at/all.md") == 3
+
+    def test_walker_accepts_compiled(self, temp_repo, tier_rules):
+        compiled = CompiledTierRules(tier_rules)
+        from_dict = [(fi.relative_path, fi.tier) for fi in walk_repository(temp_repo, tier_rules)]
+        from_compiled = [(fi.relative_path, fi.tier) for fi in walk_repository(temp_repo, compiled)]
+        assert from_dict == from_compiled
+
+
+class TestParallelWalker:
+    """walk_repository(workers=N) must match the serial walker exactly."""
+
+    def test_parallel_matches_serial(self, temp_repo, tier_rules):
+        serial = list(walk_repository(temp_repo, tier_rules))
+        parallel = list(walk_repository(temp_repo, tier_rules, workers=4))
+        assert parallel == serial
+
+    def test_order_is_depth_first_sorted(self, temp_repo, tier_rules):
+        paths = [fi.relative_path for fi in walk_repository(temp_repo, tier_rules, workers=4)]
+        # Root-level files come first, sorted by name
+        root_files = [p for p in paths if "/" not in p]
+        assert paths[: len(root_files)] == sorted(root_files)
+        # Each directory's entries are contiguous
+        assert paths.index("src/handler.spec.ts") < paths.index("src/utils.js")
+
+    def test_parallel_prunes_excluded_dirs(self, temp_repo, tier_rules):
+        paths = {fi.relative_path for fi in walk_repository(temp_repo, tier_rules, workers=4)}
+        assert not any(p.startswith(("node_modules/", ".git/", "dist/")) for p in paths)
+
+    def test_symlinked_directory_not_descended(self, temp_repo, tier_rules):
+        os.symlink(os.path.join(temp_repo, "src"), os.path.join(temp_repo, "linked"))
+        serial = list(walk_repository(temp_repo, tier_rules))
+        parallel = list(walk_repository(temp_repo, tier_rules, workers=4))
+        assert parallel == serial
+        assert not any(fi.relative_path.startswith("linked/") for fi in parallel)
+
+    def test_early_close_stops_walk(self, temp_repo, tier_rules):
+        walker = walk_repository(temp_repo, tier_rules, workers=4)
+        first = next(walker)
+        walker.close()
+        assert isinstance(first, FileInfo)
+
+
+class TestMatchGlob:
+    """Edge cases of the glob dialect used by tier-rules.yaml."""
+
+    def test_double_star_suffix_any_depth(self):
+        assert _match_glob("README.md", "**/README.md")
+        assert _match_glob("a/b/README.md", "**/README.md")
+        assert not _match_glob("a/bREADME.md", "**/README.md")
+
+    def test_prefix_is_literal_string_prefix(self):
+        # The prefix is checked with str.startswith, not per segment
+        assert _match_glob(".claude/skillsX/a.md", ".claude/skills/**/*.md")
+        assert not _match_glob("other/skills/a.md", ".claude/skills/**/*.md")
+
+    def test_trailing_double_star(self):
+        assert _match_glob("scripts/a/b.py", "scripts/**")
+        assert _match_glob("scripts", "scripts/**")
+        assert not _match_glob("src/a.py", "scripts/**")
+
+    def test_simple_pattern_basename_fallback(self):
+        assert _match_glob("jest.config.ts", "jest.config.*")
+        assert _match_glob("deep/nested/jest.config.ts", "jest.config.*")
+        assert not _match_glob("src/myjest.config.ts", "jest.config.*")
+
+    def test_star_crosses_slashes_in_full_path(self):
+        assert _match_glob("docs/adr/nested/x.md", "docs/adr/*")
+
+    def test_multiple_double_stars_fall_back_to_fnmatch(self):
+        assert _match_glob("a/x/b/y/c", "a/**/b/**/c")
+        assert not _match_glob("a/x/c", "a/**/b/**/c")
+
+
 # ===========================================================================
 # Helpers
 # ===========================================================================
@@ -412,6 +533,23 @@ def _walked_paths(root: str, tier_rules: dict) -> set:
     return {fi.relative_path for fi in walk_repository(root, tier_rules)}
 
 
+def _reference_tier(path: str, tier_rules: dict) -> int:
+    """Classify by evaluating each rule one at a time, in file order."""
+    tier_4 = tier_rules["tier_4"]
+    parts = path.split("/")
+    if any(d in parts for d in tier_4["directories"]):
+        return 4
+    if os.path.splitext(path)[1] in tier_4["extensions"]:
+        return 4
+    if os.path.basename(path) in tier_4["files"] or path in tier_4["files"]:
+        return 4
+    for tier in (1, 2):
+        for pattern in tier_rules[f"tier_{tier}"]:
+            if _match_glob(path, pattern):
+                return tier
+    return 3
+
+
 def _deep_copy_rules(rules: dict) -> dict:
     """Deep copy tier rules dict for modification in tests."""
     import copy
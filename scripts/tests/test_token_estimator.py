@@ -4,63 +4,192 @@ import os
 
 import pytest
 
-from scripts.lib.token_estimator import estimate_tokens
+from scripts.lib.token_estimator import (
+    BpeEstimator,
+    CachedEstimator,
+    content_kind,
+    count_words,
+    count_words_in_file,
+    estimate_tokens,
+    estimate_tokens_from_text,
+    get_estimator,
+)
 
 
 class TestEstimateTokens:
-    """Tests for token estimation via word count heuristic (AC4)."""
+    """Tests for the ``words`` estimator: word count * 1.3 (AC4)."""
 
     def test_known_word_count(self, tmp_path):
         """10 words * 1.3 = 13 tokens."""
         f = tmp_path / "ten_words.txt"
         f.write_text("one two three four five six seven eight nine ten")
-        assert estimate_tokens(str(f)) == 13
+        assert estimate_tokens(str(f), "words") == 13
 
     def test_single_word(self, tmp_path):
         """1 word * 1.3 = 1.3 -> rounds to 1."""
         f = tmp_path / "one.txt"
         f.write_text("hello")
-        assert estimate_tokens(str(f)) == 1
+        assert estimate_tokens(str(f), "words") == 1
 
     def test_empty_file(self, tmp_path):
         f = tmp_path / "empty.txt"
         f.write_text("")
-        assert estimate_tokens(str(f)) == 0
+        assert estimate_tokens(str(f), "words") == 0
 
     def test_whitespace_only(self, tmp_path):
         f = tmp_path / "spaces.txt"
         f.write_text("   \n\n\t  ")
-        assert estimate_tokens(str(f)) == 0
+        assert estimate_tokens(str(f), "words") == 0
 
     def test_multiline_content(self, tmp_path):
         """20 words across lines * 1.3 = 26."""
         f = tmp_path / "multi.txt"
         f.write_text("word " * 20)
-        assert estimate_tokens(str(f)) == 26
+        assert estimate_tokens(str(f), "words") == 26
 
     def test_rounding(self, tmp_path):
         """3 words * 1.3 = 3.9 -> rounds to 4."""
         f = tmp_path / "three.txt"
         f.write_text("alpha beta gamma")
-        assert estimate_tokens(str(f)) == 4
+        assert estimate_tokens(str(f), "words") == 4
 
     def test_rounding_down(self, tmp_path):
         """5 words * 1.3 = 6.5 -> rounds to 6 (banker's rounding)."""
         f = tmp_path / "five.txt"
         f.write_text("a b c d e")
         # Python round(6.5) = 6 (banker's rounding)
-        assert estimate_tokens(str(f)) == 6
+        assert estimate_tokens(str(f), "words") == 6
 
     def test_binary_file_returns_zero(self, tmp_path):
         f = tmp_path / "binary.bin"
         f.write_bytes(b"\x00\x01\x80\xff\xfe\x00\x00" * 100)
-        assert estimate_tokens(str(f)) == 0
+        assert estimate_tokens(str(f), "words") == 0
 
     def test_nonexistent_file_returns_zero(self):
-        assert estimate_tokens("/no/such/file.txt") == 0
+        assert estimate_tokens("/no/such/file.txt", "words") == 0
 
     def test_larger_document(self, tmp_path):
         """100 words * 1.3 = 130."""
         f = tmp_path / "hundred.txt"
         f.write_text(" ".join(f"word{i}" for i in range(100)))
-        assert estimate_tokens(str(f)) == 130
+        assert estimate_tokens(str(f), "words") == 130
+
+
+class TestContentKind:
+    @pytest.mark.parametrize(
+        "path,kind",
+        [("README.md", "prose"), ("src/app.ts", "code"), ("package.json", "json"), ("Makefile", "code")],
+    )
+    def test_kind_by_extension(self, path, kind):
+        assert content_kind(path) == kind
+
+
+class TestHeuristicEstimator:
+    """The default estimator weights character classes per content kind."""
+
+    def test_is_default(self, tmp_path):
+        f = tmp_path / "a.ts"
+        f.write_text("const x = foo(bar);\n")
+        assert estimate_tokens(str(f)) == estimate_tokens_from_text(
+            "const x = foo(bar);\n", "code", "heuristic"
+        )
+
+    def test_code_counts_more_than_words(self):
+        code = "if (a.b?.c[0] !== undefined) { return x && y; }\n" * 20
+        assert estimate_tokens_from_text(code, "code") > estimate_tokens_from_text(code, "code", "words")
+
+    def test_close_to_bpe_on_repo_files(self, bpe):
+        """Estimate is within 15% of BPE for representative repo files."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        samples = {
+            "prose": os.path.join(root, "..", "docs", "writing-pipeline", "epic-docgen.md"),
+            "code": os.path.join(root, "lib", "token_estimator.py"),
+        }
+        for kind, path in samples.items():
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+            exact = bpe.count(content)
+            assert abs(estimate_tokens_from_text(content, kind) - exact) / exact < 0.15
+
+    def test_empty(self):
+        assert estimate_tokens_from_text("", "code") == 0
+
+
+@pytest.fixture(scope="module")
+def bpe():
+    return BpeEstimator()
+
+
+class TestBpeEstimator:
+    """Byte-level BPE over the vendored GPT-2 merges."""
+
+    @pytest.mark.parametrize(
+        "text,tokens",
+        [
+            ("Hello world", 2),
+            ("hello", 1),
+            (" the", 1),
+            ("", 0),
+            ("héllo", 3),
+        ],
+    )
+    def test_known_counts(self, bpe, text, tokens):
+        assert bpe.count(text) == tokens
+
+    def test_unknown_estimator(self):
+        with pytest.raises(ValueError):
+            get_estimator("nope")
+
+
+class TestCachedEstimator:
+    def test_cache_hit_skips_inner(self):
+        calls = []
+
+        class Counting:
+            name = "counting"
+
+            def count(self, content, kind="prose"):
+                calls.append(content)
+                return len(content)
+
+        cached = CachedEstimator(Counting(), maxsize=2)
+        assert cached.count("abc") == 3
+        assert cached.count("abc") == 3
+        assert calls == ["abc"]
+        cached.count("d")
+        cached.count("ef")  # evicts "abc"
+        cached.count("abc")
+        assert calls == ["abc", "d", "ef", "abc"]
+
+
+class TestCountWords:
+    """Byte-level word counting matches str.split() on decoded text."""
+
+    UNICODE_TEXT = "a\u00a0b\u3000c\u2028d\x1ce\x85f \u200bg\u00e9 \U0001f600 \ufeffh"
+
+    def test_matches_str_split(self):
+        assert count_words(self.UNICODE_TEXT.encode("utf-8")) == len(self.UNICODE_TEXT.split())
+
+    def test_empty_and_whitespace(self):
+        assert count_words(b"") == 0
+        assert count_words(b" \t\r\n ") == 0
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 1 << 20])
+    def test_file_chunks_split_multibyte_chars(self, tmp_path, chunk_size):
+        f = tmp_path / "u.txt"
+        f.write_text(self.UNICODE_TEXT * 10, encoding="utf-8")
+        expected = len((self.UNICODE_TEXT * 10).split())
+        assert count_words_in_file(str(f), chunk_size) == expected
+
+    def test_invalid_utf8(self, tmp_path):
+        f = tmp_path / "bad.txt"
+        f.write_bytes(b"fine words \xff more")
+        assert count_words_in_file(str(f)) is None
+
+    def test_empty_file(self, tmp_path):
+        f = tmp_path / "empty.txt"
+        f.write_bytes(b"")
+        assert count_words_in_file(str(f)) == 0
+
+    def test_missing_file(self):
+        assert count_words_in_file("/no/such/file.txt") is None
@@ -0,0 +1,81 @@
+"""Tests for scripts.lib.yaml_loader."""
+
+import io
+import os
+
+import pytest
+import yaml
+
+from scripts.lib import yaml_loader
+from scripts.lib.metadata_parser import MAX_FRONTMATTER_SIZE, _scan_frontmatter
+from scripts.lib.tier_classifier import load_tier_rules, walk_repository
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+RULES_PATH = os.path.join(REPO_ROOT, "docs", "_docgen", "tier-rules.yaml")
+
+
+def _pure_python_load(text: str):
+    return yaml.load(text, Loader=yaml.SafeLoader)
+
+
+def _load_outcome(loader, text: str):
+    """Parsed value, or the exception type if parsing fails."""
+    try:
+        return loader(text)
+    except yaml.YAMLError:
+        return yaml.YAMLError
+
+
+def _repo_frontmatter_blocks() -> list:
+    """Every frontmatter block in the repository's markdown files."""
+    blocks = []
+    for fi in walk_repository(REPO_ROOT, load_tier_rules(RULES_PATH)):
+        if not fi.relative_path.endswith(".md"):
+            continue
+        try:
+            with open(fi.path, "r", encoding="utf-8") as f:
+                text = _scan_frontmatter(f, fi.path, MAX_FRONTMATTER_SIZE)
+        except (OSError, UnicodeDecodeError):
+            continue
+        if text is not None:
+            blocks.append((fi.relative_path, text))
+    return blocks
+
+
+class TestSafeLoad:
+    """safe_load behaves like yaml.safe_load."""
+
+    def test_parses_mapping(self):
+        assert yaml_loader.safe_load("a: 1\nb: [x, y]\n") == {"a": 1, "b": ["x", "y"]}
+
+    def test_accepts_stream(self):
+        assert yaml_loader.safe_load(io.StringIO("key: value\n")) == {"key": "value"}
+
+    def test_malformed_raises_yaml_error(self):
+        with pytest.raises(yaml.YAMLError):
+            yaml_loader.safe_load("title: [unclosed")
+
+    def test_rejects_python_tags(self):
+        with pytest.raises(yaml.YAMLError):
+            yaml_loader.safe_load("!!python/object/apply:os.system ['true']")
+
+    def test_uses_c_loader_when_available(self):
+        assert yaml_loader.HAS_LIBYAML == yaml.__with_libyaml__
+
+
+@pytest.mark.skipif(not yaml_loader.HAS_LIBYAML, reason="PyYAML built without libyaml")
+class TestLoaderParity:
+    """The C and pure-Python loaders agree on every YAML input in the repo."""
+
+    def test_every_repo_frontmatter_block(self):
+        blocks = _repo_frontmatter_blocks()
+        assert blocks, "expected frontmatter blocks in the repository"
+        for rel_path, text in blocks:
+            assert _load_outcome(yaml_loader.safe_load, text) == _load_outcome(
+                _pure_python_load, text
+            ), rel_path
+
+    def test_tier_rules(self):
+        with open(RULES_PATH) as f:
+            text = f.read()
+        assert yaml_loader.safe_load(text) == _pure_python_load(text)